@@ -3,11 +3,15 @@ Fact Merger
 Intelligently merge facts from multiple tool executions
 """
 
-from sgpt.agent.state import AgentState, Target, Vulnerability, FactStore
+from sgpt.agent.state import AgentState, Target, Vulnerability, FactStore, OrderedSet
 from typing import Dict, List, Any
 from datetime import datetime
 
 
+# Keys merge_batch handles itself; anything else lands in custom_facts
+_MERGED_KEYS = frozenset({"hosts", "targets", "vulnerabilities", "credentials", "services"})
+
+
 class FactMerger:
     """Merge facts from different sources intelligently"""
     
@@ -23,7 +27,7 @@ class FactMerger:
             Cleaned FactStore
         """
         # Deduplicate live hosts
-        fact_store.live_hosts = list(set(fact_store.live_hosts))
+        fact_store.live_hosts = OrderedSet(fact_store.live_hosts)
         
         # Deduplicate targets (by IP)
         unique_targets = {}
@@ -47,31 +51,62 @@ class FactMerger:
             state: Current agent state
             new_facts: New facts extracted from tool output
         """
+        FactMerger.merge_batch(state, [new_facts])
+    
+    @staticmethod
+    def merge_batch(state: AgentState, facts_list: List[Dict[str, Any]]):
+        """
+        Merge several tool outputs' facts into agent state in one pass
         
-        # Merge hosts
-        if "hosts" in new_facts:
-            FactMerger.merge_hosts(state.facts, new_facts["hosts"])
-        
-        # Merge targets
-        if "targets" in new_facts:
-            FactMerger.merge_targets(state.facts, new_facts["targets"])
-        
-        # Merge vulnerabilities
-        if "vulnerabilities" in new_facts:
-            FactMerger.merge_vulnerabilities(state.facts, new_facts["vulnerabilities"])
+        Targets are indexed by IP once for the whole batch and
+        vulnerabilities dedup through the fact store's persistent key
+        index, so m merges cost O(n + m) rather than O(n * m).
         
-        # Merge credentials
-        if "credentials" in new_facts:
-            FactMerger.merge_credentials(state.facts, new_facts["credentials"])
+        Args:
+            state: Current agent state
+            facts_list: New facts dicts, merged in order
+        """
+        fact_store = state.facts
         
-        # Merge services
-        if "services" in new_facts:
-            FactMerger.merge_services(state.facts, new_facts["services"])
+        targets_by_ip = {}
+        for t in fact_store.targets:
+            targets_by_ip.setdefault(t.ip, t)
         
-        # Merge custom facts
-        for key, value in new_facts.items():
-            if key not in ["hosts", "targets", "vulnerabilities", "credentials", "services"]:
-                state.facts.custom_facts[key] = value
+        for new_facts in facts_list:
+            # Merge hosts
+            fact_store.live_hosts.update(host for host in new_facts.get("hosts", ()) if host)
+            
+            # Merge targets
+            for new_target_data in new_facts.get("targets", ()):
+                ip = new_target_data.get("ip")
+                if not ip:
+                    continue
+                
+                existing_target = targets_by_ip.get(ip)
+                if existing_target:
+                    FactMerger._update_target(existing_target, new_target_data)
+                else:
+                    new_target = FactMerger._create_target(new_target_data)
+                    fact_store.targets.append(new_target)
+                    targets_by_ip[ip] = new_target
+                    fact_store.live_hosts.add(ip)
+            
+            # Merge vulnerabilities (duplicate: same CVE ID, or same name + target + port)
+            for new_vuln_data in new_facts.get("vulnerabilities", ()):
+                fact_store.add_vulnerability(FactMerger._create_vulnerability(new_vuln_data))
+            
+            # Merge credentials
+            if "credentials" in new_facts:
+                FactMerger.merge_credentials(fact_store, new_facts["credentials"])
+            
+            # Merge services
+            if "services" in new_facts:
+                FactMerger.merge_services(fact_store, new_facts["services"])
+            
+            # Merge custom facts
+            for key, value in new_facts.items():
+                if key not in _MERGED_KEYS:
+                    fact_store.custom_facts[key] = value
     
     @staticmethod
     def merge_hosts(fact_store: FactStore, new_hosts: List[str]):
@@ -82,9 +117,7 @@ class FactMerger:
             fact_store: Current fact store
             new_hosts: New host IPs to add
         """
-        for host in new_hosts:
-            if host and host not in fact_store.live_hosts:
-                fact_store.live_hosts.append(host)
+        fact_store.live_hosts.update(host for host in new_hosts if host)
     
     @staticmethod
     def merge_targets(fact_store: FactStore, new_targets: List[Dict]):
@@ -117,9 +150,8 @@ class FactMerger:
                 new_target = FactMerger._create_target(new_target_data)
                 fact_store.targets.append(new_target)
                 
-                # Also add to live_hosts if not present
-                if ip not in fact_store.live_hosts:
-                    fact_store.live_hosts.append(ip)
+                # Also add to live_hosts
+                fact_store.live_hosts.add(ip)
     
     @staticmethod
     def _update_target(target: Target, new_data: Dict):
@@ -178,35 +210,20 @@ class FactMerger:
             new_vulns: New vulnerability data
         """
         for new_vuln_data in new_vulns:
-            # Create Vulnerability object
-            new_vuln = Vulnerability(
-                cve_id=new_vuln_data.get("cve_id"),
-                name=new_vuln_data.get("name", "Unknown"),
-                severity=new_vuln_data.get("severity", "unknown"),
-                target=new_vuln_data.get("target", "unknown"),
-                port=new_vuln_data.get("port"),
-                description=new_vuln_data.get("description", ""),
-                exploit_available=new_vuln_data.get("exploit_available", False)
-            )
-            
-            # Check for duplicates
-            is_duplicate = False
-            
-            for existing_vuln in fact_store.vulnerabilities:
-                # Match by CVE ID
-                if new_vuln.cve_id and new_vuln.cve_id == existing_vuln.cve_id:
-                    is_duplicate = True
-                    break
-                
-                # Match by name + target + port
-                if (new_vuln.name == existing_vuln.name and
-                    new_vuln.target == existing_vuln.target and
-                    new_vuln.port == existing_vuln.port):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                fact_store.vulnerabilities.append(new_vuln)
+            fact_store.add_vulnerability(FactMerger._create_vulnerability(new_vuln_data))
+    
+    @staticmethod
+    def _create_vulnerability(data: Dict) -> Vulnerability:
+        """Create new Vulnerability from dict"""
+        return Vulnerability(
+            cve_id=data.get("cve_id"),
+            name=data.get("name", "Unknown"),
+            severity=data.get("severity", "unknown"),
+            target=data.get("target", "unknown"),
+            port=data.get("port"),
+            description=data.get("description", ""),
+            exploit_available=data.get("exploit_available", False)
+        )
     
     @staticmethod
     def merge_credentials(fact_store: FactStore, new_creds: List[Dict]):
@@ -3,10 +3,24 @@ State Persistence
 Save and load agent state
 """
 
+from contextlib import contextmanager
 from pathlib import Path
+import copy
 import json
-from typing import Optional
-from sgpt.agent.state import AgentState
+from typing import Iterator, Optional, Sequence, Union
+from sgpt.agent.state import AgentState, Command
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_line(data: dict) -> bytes:
+    """Serialize one ndjson record, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return json.dumps(data).encode() + b"\n"
 
 
 class AgentPersistence:
@@ -16,6 +30,11 @@ class AgentPersistence:
         self.agents_dir = config_dir / "agents"
         self.storage_path = config_dir
         self.agents_dir.mkdir(parents=True, exist_ok=True)
+        # session_id -> serialized state, while inside buffered()
+        self._buffer: Optional[dict[str, dict]] = None
+        # session_id -> (commands in commands.ndjson, its size, its mtime_ns)
+        # as of our last read or write; a mismatch means another writer
+        self._saved_commands: dict[str, tuple[int, int, int]] = {}
     
     def get_session_dir(self, session_id: str) -> Path:
         """Get directory for session"""
@@ -23,16 +42,105 @@ class AgentPersistence:
         session_dir.mkdir(parents=True, exist_ok=True)
         return session_dir
     
+    @contextmanager
+    def buffered(self):
+        """
+        Hold save_state() writes in memory and flush each session once on exit
+        
+        load_state() inside the block sees the buffered snapshot. Nested
+        blocks join the outer one.
+        """
+        if self._buffer is not None:
+            yield self
+            return
+        
+        self._buffer = {}
+        try:
+            yield self
+        finally:
+            pending, self._buffer = self._buffer, None
+            for session_id, data in pending.items():
+                self._write_state(session_id, data)
+    
     def save_state(self, state: AgentState):
-        """Save agent state"""
-        session_dir = self.get_session_dir(state.session_id)
-        state_file = session_dir / "state.json"
+        """
+        Save agent state
+        
+        Command history goes to an append-only commands.ndjson sidecar, so
+        each save only serializes and writes commands added since the last one.
+        """
+        if self._buffer is not None:
+            # Snapshot now; the live state may keep changing before flush
+            self._buffer[state.session_id] = copy.deepcopy(state.to_dict())
+            return
+        
+        data = state.to_dict(include_commands=False)
+        self._write_state(state.session_id, data, state.commands_executed)
+    
+    def _write_state(self, session_id: str, data: dict,
+                     commands: Optional[Sequence[Union[Command, dict]]] = None):
+        """Write serialized state to state.json and sync commands.ndjson"""
+        if commands is None:
+            data = dict(data)
+            commands = data.pop("commands_executed", [])
+        
+        session_dir = self.get_session_dir(session_id)
+        self._append_commands(session_dir, session_id, commands)
+        
+        with open(session_dir / "state.json", 'w') as f:
+            json.dump(data, f, indent=2)
+    
+    def _append_commands(self, session_dir: Path, session_id: str,
+                         commands: Sequence[Union[Command, dict]]):
+        """Append unsaved commands; rewrite the file if its contents are unknown"""
+        commands_file = session_dir / "commands.ndjson"
+        saved = self._saved_count(session_id, commands_file)
+        if saved is None or saved > len(commands):
+            mode, saved = "wb", 0
+        elif saved == len(commands):
+            return
+        else:
+            mode = "ab"
         
-        with open(state_file, 'w') as f:
-            json.dump(state.to_dict(), f, indent=2)
+        lines = b"".join(
+            _dumps_line(cmd.to_dict() if isinstance(cmd, Command) else cmd)
+            for cmd in commands[saved:]
+        )
+        with open(commands_file, mode) as f:
+            f.write(lines)
+        self._remember_commands(session_id, commands_file, len(commands))
+    
+    def _saved_count(self, session_id: str, commands_file: Path) -> Optional[int]:
+        """Commands known to be in the sidecar, or None if it changed behind our back"""
+        known = self._saved_commands.get(session_id)
+        if known is None:
+            return None
+        try:
+            st = commands_file.stat()
+        except OSError:
+            return None
+        count, size, mtime_ns = known
+        if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+            return None
+        return count
+    
+    def _remember_commands(self, session_id: str, commands_file: Path, count: int):
+        st = commands_file.stat()
+        self._saved_commands[session_id] = (count, st.st_size, st.st_mtime_ns)
+    
+    @staticmethod
+    def _iter_commands(path: Path) -> Iterator[dict]:
+        """Stream serialized commands from an ndjson file"""
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
     
     def load_state(self, session_id: str) -> Optional[AgentState]:
         """Load agent state"""
+        if self._buffer is not None and session_id in self._buffer:
+            return AgentState.from_dict(copy.deepcopy(self._buffer[session_id]))
+        
         session_dir = self.get_session_dir(session_id)
         state_file = session_dir / "state.json"
         
@@ -42,6 +150,12 @@ class AgentPersistence:
         with open(state_file, 'r') as f:
             data = json.load(f)
         
+        # Sessions saved before the sidecar keep commands inline in state.json
+        commands_file = session_dir / "commands.ndjson"
+        if commands_file.exists():
+            data["commands_executed"] = list(self._iter_commands(commands_file))
+            self._remember_commands(session_id, commands_file, len(data["commands_executed"]))
+        
         return AgentState.from_dict(data)
     
     def list_sessions(self) -> list[str]:
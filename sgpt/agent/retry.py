@@ -4,6 +4,7 @@ Retry failed operations with exponential backoff
 """
 
 import asyncio
+import inspect
 import time
 from typing import Callable, TypeVar, Optional
 from functools import wraps
@@ -21,7 +22,8 @@ class RetryHandler:
         base_delay: float = 1.0,
         max_delay: float = 30.0,
         exponential_base: float = 2.0,
-        exceptions: tuple = (Exception,)
+        exceptions: tuple = (Exception,),
+        sleep_fn: Optional[Callable[[float], object]] = None
     ) -> Optional[T]:
         """
         Retry async function with exponential backoff
@@ -33,11 +35,13 @@ class RetryHandler:
             max_delay: Maximum delay in seconds
             exponential_base: Exponential backoff multiplier
             exceptions: Tuple of exceptions to catch
+            sleep_fn: Backoff sleeper, sync or async (default: asyncio.sleep)
             
         Returns:
             Function result or None if all attempts failed
         """
         last_exception = None
+        sleep_fn = sleep_fn or asyncio.sleep
         
         for attempt in range(1, max_attempts + 1):
             try:
@@ -56,7 +60,9 @@ class RetryHandler:
                 print(f"\n⚠️  Attempt {attempt}/{max_attempts} failed: {e}")
                 print(f"   Retrying in {delay:.1f}s...")
                 
-                await asyncio.sleep(delay)
+                pause = sleep_fn(delay)
+                if inspect.isawaitable(pause):
+                    await pause
         
         return None
     
@@ -67,7 +73,8 @@ class RetryHandler:
         base_delay: float = 1.0,
         max_delay: float = 30.0,
         exponential_base: float = 2.0,
-        exceptions: tuple = (Exception,)
+        exceptions: tuple = (Exception,),
+        sleep_fn: Optional[Callable[[float], object]] = None
     ) -> Optional[T]:
         """
         Retry sync function with exponential backoff
@@ -79,11 +86,13 @@ class RetryHandler:
             max_delay: Maximum delay in seconds
             exponential_base: Exponential backoff multiplier
             exceptions: Tuple of exceptions to catch
+            sleep_fn: Backoff sleeper (default: time.sleep)
             
         Returns:
             Function result or None if all attempts failed
         """
         last_exception = None
+        sleep_fn = sleep_fn or time.sleep
         
         for attempt in range(1, max_attempts + 1):
             try:
@@ -102,12 +111,13 @@ class RetryHandler:
                 print(f"\n⚠️  Attempt {attempt}/{max_attempts} failed: {e}")
                 print(f"   Retrying in {delay:.1f}s...")
                 
-                time.sleep(delay)
+                sleep_fn(delay)
         
         return None
 
 
-def with_retry(max_attempts: int = 3, base_delay: float = 1.0):
+def with_retry(max_attempts: int = 3, base_delay: float = 1.0,
+               sleep_fn: Optional[Callable[[float], object]] = None):
     """
     Decorator for automatic retry with exponential backoff
     
@@ -125,7 +135,8 @@ def with_retry(max_attempts: int = 3, base_delay: float = 1.0):
             return await RetryHandler.retry_async(
                 _func,
                 max_attempts=max_attempts,
-                base_delay=base_delay
+                base_delay=base_delay,
+                sleep_fn=sleep_fn
             )
         
         @wraps(func)
@@ -136,7 +147,8 @@ def with_retry(max_attempts: int = 3, base_delay: float = 1.0):
             return RetryHandler.retry_sync(
                 _func,
                 max_attempts=max_attempts,
-                base_delay=base_delay
+                base_delay=base_delay,
+                sleep_fn=sleep_fn
             )
         
         # Return appropriate wrapper based on function type
@@ -3,6 +3,7 @@ Agent State Management
 Defines the core AgentState model and related types
 """
 
+from collections.abc import Iterable, MutableSet
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -23,6 +24,34 @@ class RedTeamPhase(Enum):
     REPORTING = "reporting"
 
 
+class OrderedSet(MutableSet):
+    """Set that iterates in insertion order (backed by a dict)"""
+    
+    def __init__(self, items: Iterable = ()):
+        self._items = dict.fromkeys(items)
+    
+    def __contains__(self, item) -> bool:
+        return item in self._items
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._items)!r})"
+    
+    def add(self, item):
+        self._items[item] = None
+    
+    def discard(self, item):
+        self._items.pop(item, None)
+    
+    def update(self, items: Iterable):
+        self._items.update(dict.fromkeys(items))
+
+
 @dataclass
 class PhaseTransition:
     """Record of phase transitions"""
@@ -100,17 +129,48 @@ class FactStore:
     """Structured knowledge base"""
     subnet: Optional[str] = None
     targets: list[Target] = field(default_factory=list)
-    live_hosts: list[str] = field(default_factory=list)
-    open_ports: dict[str, list[int]] = field(default_factory=dict)
+    # O(1) membership; live_hosts keeps discovery order (tools target the
+    # first host), ports are serialized as sorted lists
+    live_hosts: OrderedSet = field(default_factory=OrderedSet)
+    open_ports: dict[str, set[int]] = field(default_factory=dict)
     services: dict[str, dict] = field(default_factory=dict)
     vulnerabilities: list[Vulnerability] = field(default_factory=list)
     credentials: list[dict] = field(default_factory=list)
     custom_facts: dict = field(default_factory=dict)
+    # Vulnerability dedup keys, synced lazily from the list; not serialized
+    _vuln_index: set = field(default_factory=set, init=False, repr=False, compare=False)
+    _vuln_indexed: int = field(default=0, init=False, repr=False, compare=False)
     
     def add_host(self, ip: str):
         """Add discovered host"""
-        if ip not in self.live_hosts:
-            self.live_hosts.append(ip)
+        self.live_hosts.add(ip)
+    
+    @staticmethod
+    def _vuln_keys(vuln: "Vulnerability") -> tuple:
+        """Dedup keys: CVE ID (if present) and name + target + port"""
+        key = (vuln.name, vuln.target, vuln.port)
+        return (("cve", vuln.cve_id), key) if vuln.cve_id else (key,)
+    
+    def vuln_index(self) -> set:
+        """Dedup keys of known vulnerabilities, indexing any appended since the last call"""
+        if len(self.vulnerabilities) < self._vuln_indexed:
+            self._vuln_index.clear()
+            self._vuln_indexed = 0
+        for vuln in self.vulnerabilities[self._vuln_indexed:]:
+            self._vuln_index.update(self._vuln_keys(vuln))
+        self._vuln_indexed = len(self.vulnerabilities)
+        return self._vuln_index
+    
+    def add_vulnerability(self, vuln: "Vulnerability") -> bool:
+        """Add vulnerability unless a duplicate is known; returns True if added"""
+        index = self.vuln_index()
+        keys = self._vuln_keys(vuln)
+        if any(k in index for k in keys):
+            return False
+        index.update(keys)
+        self.vulnerabilities.append(vuln)
+        self._vuln_indexed += 1
+        return True
             
     def add_target(self, target: Target):
         """Add target with details"""
@@ -140,8 +200,8 @@ class FactStore:
                 }
                 for t in self.targets
             ],
-            "live_hosts": self.live_hosts,
-            "open_ports": self.open_ports,
+            "live_hosts": list(self.live_hosts),
+            "open_ports": {ip: sorted(ports) for ip, ports in self.open_ports.items()},
             "services": self.services,
             "vulnerabilities": [
                 {
@@ -226,9 +286,9 @@ class AgentState:
         """Record failure"""
         self.failures.append(failure)
     
-    def to_dict(self) -> dict:
+    def to_dict(self, include_commands: bool = True) -> dict:
         """Serialize to dict for persistence"""
-        return {
+        data = {
             "session_id": self.session_id,
             "goal": self.goal,
             "created_at": self.created_at.isoformat(),
@@ -245,7 +305,6 @@ class AgentState:
             "auto_context": self.auto_context,
             "tools_available": self.tools_available,
             "facts": self.facts.to_dict(),
-            "commands_executed": [cmd.to_dict() for cmd in self.commands_executed],
             "failures": [f.to_dict() for f in self.failures],
             "current_objective": self.current_objective,
             "proposed_command": self.proposed_command,
@@ -256,6 +315,9 @@ class AgentState:
             "llm_calls": self.llm_calls,
             "tokens_used": self.tokens_used
         }
+        if include_commands:
+            data["commands_executed"] = [cmd.to_dict() for cmd in self.commands_executed]
+        return data
     
     @classmethod
     def from_dict(cls, data: dict) -> "AgentState":
@@ -283,8 +345,10 @@ class AgentState:
             facts_data = data["facts"]
             state.facts = FactStore(
                 subnet=facts_data.get("subnet"),
-                live_hosts=facts_data.get("live_hosts", []),
-                open_ports=facts_data.get("open_ports", {}),
+                live_hosts=OrderedSet(facts_data.get("live_hosts", ())),
+                open_ports={
+                    ip: set(ports) for ip, ports in facts_data.get("open_ports", {}).items()
+                },
                 services=facts_data.get("services", {}),
                 credentials=facts_data.get("credentials", []),
                 custom_facts=facts_data.get("custom_facts", {})
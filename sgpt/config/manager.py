@@ -3,12 +3,19 @@ Configuration Manager
 Load and manage ShellGPT configuration from YAML files and environment variables
 """
 
+import copy
 import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 
 @dataclass
 class LLMConfig:
@@ -87,6 +94,13 @@ class AgentConfig:
     storage: StorageConfig
 
 
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML config file; cached per (path, mtime, size) so edits invalidate it"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
 class ConfigManager:
     """Manage ShellGPT configuration"""
     
@@ -105,6 +119,8 @@ class ConfigManager:
         
         self.config: Optional[AgentConfig] = None
         self._config_path = Path.home() / ".sgpt" / "config.yaml"
+        # Defaults merged with the config file, before env overrides
+        self._file_config: Optional[Dict[str, Any]] = None
         self._initialized = True
     
     def load(self, config_path: Path = None) -> AgentConfig:
@@ -129,12 +145,34 @@ class ConfigManager:
         config_dict = self._get_defaults()
         
         # Load from file if exists
-        if self._config_path.exists():
-            with open(self._config_path, 'r') as f:
-                file_config = yaml.safe_load(f) or {}
-                config_dict = self._merge_configs(config_dict, file_config)
+        try:
+            st = self._config_path.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            file_config = _parse_config_file(str(self._config_path), st.st_mtime_ns, st.st_size)
+            # Copy so merged configs never alias the cached parse
+            config_dict = self._merge_configs(config_dict, copy.deepcopy(file_config))
+        
+        self._file_config = config_dict
+        return self._apply_env_overrides(copy.deepcopy(config_dict))
+    
+    def reload_env_overrides(self) -> AgentConfig:
+        """
+        Re-apply environment variables to the already loaded file config
         
-        # Override with environment variables
+        Skips re-reading the config file; falls back to a full load if
+        nothing has been loaded yet.
+        
+        Returns:
+            AgentConfig instance
+        """
+        if self._file_config is None:
+            return self.load()
+        return self._apply_env_overrides(copy.deepcopy(self._file_config))
+    
+    def _apply_env_overrides(self, config_dict: Dict[str, Any]) -> AgentConfig:
+        """Merge environment variables into config_dict and build the config"""
         env_config = self._load_from_env()
         config_dict = self._merge_configs(config_dict, env_config)
         
@@ -3,6 +3,8 @@ Session Report Generator
 Generate comprehensive markdown reports from agent sessions
 """
 
+import io
+
 from sgpt.agent.state import AgentState
 from datetime import datetime
 from pathlib import Path
@@ -107,14 +109,15 @@ This report documents an automated red-team assessment conducted by ShellGPT v2.
     @staticmethod
     def _generate_timeline(state: AgentState) -> str:
         """Generate command timeline"""
-        timeline = "## Command Timeline\n\n"
+        buf = io.StringIO()
+        buf.write("## Command Timeline\n\n")
         
         if not state.commands_executed:
-            timeline += "*No commands executed yet.*\n"
-            return timeline
+            buf.write("*No commands executed yet.*\n")
+            return buf.getvalue()
         
-        timeline += "| # | Time | Phase | Command | Status |\n"
-        timeline += "|---|------|-------|---------|--------|\n"
+        buf.write("| # | Time | Phase | Command | Status |\n")
+        buf.write("|---|------|-------|---------|--------|\n")
         
         for i, cmd in enumerate(state.commands_executed, 1):
             time_str = cmd.timestamp.strftime('%H:%M:%S')
@@ -122,52 +125,54 @@ This report documents an automated red-team assessment conducted by ShellGPT v2.
             command_str = cmd.command[:50] + "..." if len(cmd.command) > 50 else cmd.command
             status_str = "✅ OK" if cmd.exit_code == 0 else f"❌ {cmd.exit_code}"
             
-            timeline += f"| {i} | {time_str} | {phase_str} | `{command_str}` | {status_str} |\n"
+            buf.write(f"| {i} | {time_str} | {phase_str} | `{command_str}` | {status_str} |\n")
         
-        return timeline
+        return buf.getvalue()
     
     @staticmethod
     def _generate_assets(state: AgentState) -> str:
         """Generate discovered assets section"""
-        assets = "## Discovered Assets\n\n"
+        buf = io.StringIO()
+        buf.write("## Discovered Assets\n\n")
         
         if not state.facts.targets:
-            assets += "*No targets identified yet.*\n"
-            return assets
+            buf.write("*No targets identified yet.*\n")
+            return buf.getvalue()
         
-        assets += "### Targets\n\n"
+        buf.write("### Targets\n\n")
         
         for target in state.facts.targets:
-            assets += f"#### {target.ip}"
+            buf.write(f"#### {target.ip}")
             if target.hostname:
-                assets += f" ({target.hostname})"
-            assets += "\n\n"
+                buf.write(f" ({target.hostname})")
+            buf.write("\n\n")
             
             # Ports
             if target.ports:
-                assets += f"**Open Ports:** {', '.join(map(str, sorted(target.ports)))}\n\n"
+                buf.write(f"**Open Ports:** {', '.join(map(str, sorted(target.ports)))}\n\n")
             
             # Services
             if target.services:
-                assets += "**Services:**\n"
+                buf.write("**Services:**\n")
                 for port, service in sorted(target.services.items()):
-                    assets += f"- Port {port}: {service}\n"
-                assets += "\n"
+                    buf.write(f"- Port {port}: {service}\n")
+                buf.write("\n")
             
             # OS
             if target.os:
-                assets += f"**Operating System:** {target.os}\n\n"
+                buf.write(f"**Operating System:** {target.os}\n\n")
             
             # Vulnerabilities
             if target.vulnerabilities:
-                assets += f"**Vulnerabilities:** {len(target.vulnerabilities)} found\n\n"
+                buf.write(f"**Vulnerabilities:** {len(target.vulnerabilities)} found\n\n")
         
-        return assets
+        return buf.getvalue()
     
     @staticmethod
     def _generate_vulnerabilities(state: AgentState) -> str:
         """Generate vulnerabilities section"""
-        vulns = "## Vulnerabilities\n\n"
+        buf = io.StringIO()
+        buf.write("## Vulnerabilities\n\n")
         
         # Group by severity
         by_severity = {}
@@ -193,102 +198,105 @@ This report documents an automated red-team assessment conducted by ShellGPT v2.
                 'unknown': '⚪'
             }.get(severity, '⚪')
             
-            vulns += f"### {icon} {severity.upper()} Severity ({len(severity_vulns)})\n\n"
+            buf.write(f"### {icon} {severity.upper()} Severity ({len(severity_vulns)})\n\n")
             
             for vuln in severity_vulns:
-                vulns += f"**{vuln.name}**"
+                buf.write(f"**{vuln.name}**")
                 if vuln.cve_id:
-                    vulns += f" ({vuln.cve_id})"
-                vulns += "\n\n"
+                    buf.write(f" ({vuln.cve_id})")
+                buf.write("\n\n")
                 
-                vulns += f"- **Target:** {vuln.target}"
+                buf.write(f"- **Target:** {vuln.target}")
                 if vuln.port:
-                    vulns += f":{vuln.port}"
-                vulns += "\n"
+                    buf.write(f":{vuln.port}")
+                buf.write("\n")
                 
                 if vuln.description:
-                    vulns += f"- **Description:** {vuln.description}\n"
+                    buf.write(f"- **Description:** {vuln.description}\n")
                 
                 if vuln.exploit_available:
-                    vulns += "- **Exploit:** ⚠️ PUBLIC EXPLOIT AVAILABLE\n"
+                    buf.write("- **Exploit:** ⚠️ PUBLIC EXPLOIT AVAILABLE\n")
                 
-                vulns += "\n"
+                buf.write("\n")
         
-        return vulns
+        return buf.getvalue()
     
     @staticmethod
     def _generate_credentials(state: AgentState) -> str:
         """Generate credentials section"""
-        creds = "## 🔐 Captured Credentials\n\n"
+        buf = io.StringIO()
+        buf.write("## 🔐 Captured Credentials\n\n")
         
-        creds += "> ⚠️ **CONFIDENTIAL** - Handle with care\n\n"
+        buf.write("> ⚠️ **CONFIDENTIAL** - Handle with care\n\n")
         
-        creds += "| Host | Username | Password |\n"
-        creds += "|------|----------|----------|\n"
+        buf.write("| Host | Username | Password |\n")
+        buf.write("|------|----------|----------|\n")
         
         for cred in state.facts.credentials:
             host = cred.get('host', 'unknown')
             username = cred.get('username', 'unknown')
             password = cred.get('password', 'unknown')
-            creds += f"| {host} | {username} | `{password}` |\n"
+            buf.write(f"| {host} | {username} | `{password}` |\n")
         
-        creds += "\n"
-        return creds
+        buf.write("\n")
+        return buf.getvalue()
     
     @staticmethod
     def _generate_recommendations(state: AgentState) -> str:
         """Generate recommendations"""
-        recs = "## Recommendations\n\n"
+        buf = io.StringIO()
+        buf.write("## Recommendations\n\n")
         
         # Based on findings
         if state.facts.vulnerabilities:
-            high_severity = [v for v in state.facts.vulnerabilities 
-                           in ('critical', 'high')]
+            high_severity = [v for v in state.facts.vulnerabilities
+                             if v.severity.lower() in ('critical', 'high')]
             
             if high_severity:
-                recs += "### Immediate Actions\n\n"
-                recs += "1. **Patch Critical Vulnerabilities:** Address high/critical severity issues immediately\n"
-                recs += f"2. **Review {len(high_severity)} High-Risk Findings:** Prioritize remediation\n\n"
+                buf.write("### Immediate Actions\n\n")
+                buf.write("1. **Patch Critical Vulnerabilities:** Address high/critical severity issues immediately\n")
+                buf.write(f"2. **Review {len(high_severity)} High-Risk Findings:** Prioritize remediation\n\n")
         
         if state.facts.credentials:
-            recs += "### Security Improvements\n\n"
-            recs += "1. **Strengthen Passwords:** Implement password complexity requirements\n"
-            recs += "2. **Enable MFA:** Deploy multi-factor authentication\n"
-            recs += "3. **Review Access Controls:** Audit user permissions\n\n"
+            buf.write("### Security Improvements\n\n")
+            buf.write("1. **Strengthen Passwords:** Implement password complexity requirements\n")
+            buf.write("2. **Enable MFA:** Deploy multi-factor authentication\n")
+            buf.write("3. **Review Access Controls:** Audit user permissions\n\n")
         
         # General recommendations
-        recs += "### General\n\n"
-        recs += "1. **Regular Scanning:** Implement continuous security monitoring\n"
-        recs += "2. **Patch Management:** Establish systematic patching process\n"
-        recs += "3. **Network Segmentation:** Isolate critical assets\n"
-        recs += "4. **Security Training:** Educate staff on security best practices\n"
+        buf.write("### General\n\n")
+        buf.write("1. **Regular Scanning:** Implement continuous security monitoring\n")
+        buf.write("2. **Patch Management:** Establish systematic patching process\n")
+        buf.write("3. **Network Segmentation:** Isolate critical assets\n")
+        buf.write("4. **Security Training:** Educate staff on security best practices\n")
         
-        return recs
+        return buf.getvalue()
     
     @staticmethod
     def _generate_appendix(state: AgentState) -> str:
         """Generate appendix"""
-        appendix = "## Appendix\n\n"
+        buf = io.StringIO()
+        buf.write("## Appendix\n\n")
         
-        appendix += "### Tools Used\n\n"
+        buf.write("### Tools Used\n\n")
         tools_used = set()
         for cmd in state.commands_executed:
             tools_used.add(cmd.tool_used)
         
         for tool in sorted(tools_used):
-            appendix += f"- {tool}\n"
+            buf.write(f"- {tool}\n")
         
-        appendix += "\n### Phase Transitions\n\n"
+        buf.write("\n### Phase Transitions\n\n")
         
         if state.phase_history:
             for trans in state.phase_history:
                 time_str = trans.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                appendix += f"- **{time_str}:** {trans.from_phase.value} → {trans.to_phase.value}\n"
-                appendix += f"  - Reason: {trans.reason}\n"
+                buf.write(f"- **{time_str}:** {trans.from_phase.value} → {trans.to_phase.value}\n")
+                buf.write(f"  - Reason: {trans.reason}\n")
         else:
-            appendix += "*No phase transitions yet.*\n"
+            buf.write("*No phase transitions yet.*\n")
         
-        appendix += "\n---\n\n"
-        appendix += "*Report generated by ShellGPT v2 - Red-Team Automation Agent*\n"
+        buf.write("\n---\n\n")
+        buf.write("*Report generated by ShellGPT v2 - Red-Team Automation Agent*\n")
         
-        return appendix
+        return buf.getvalue()
@@ -3,12 +3,77 @@ Tool Availability Checker
 Detects which tools are installed and available on the system
 """
 
+import hashlib
+import json
+import os
 import subprocess
 import shutil
-from typing import Dict, List
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
 from pathlib import Path
 
 
+# Results from a previous run are reused while PATH is unchanged and the file is fresh
+_AVAIL_CACHE_PATH = Path.home() / ".cache" / "sgpt" / "tool_avail.json"
+_AVAIL_CACHE_TTL = 300
+
+
+@lru_cache(maxsize=1)
+def _path_executables(path: str) -> Dict[str, str]:
+    """
+    Map file names on a PATH string to their first full path
+    
+    One scandir per PATH entry; cached until PATH changes.
+    """
+    found = {}
+    for directory in path.split(os.pathsep):
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                for entry in entries:
+                    if entry.name not in found and entry.is_file():
+                        found[entry.name] = entry.path
+        except OSError:
+            continue
+    return found
+
+
+def _path_hash(path: str) -> str:
+    return hashlib.sha256(path.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def _load_cached_availability(cache_path: Path, path_hash: str, binaries: List[str]) -> Optional[Dict[str, bool]]:
+    """Return cached results if they match PATH, cover all binaries and are within the TTL"""
+    try:
+        if time.time() - cache_path.stat().st_mtime >= _AVAIL_CACHE_TTL:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(cached, dict) or cached.get("path_hash") != path_hash:
+        return None
+    results = cached.get("results")
+    if not isinstance(results, dict):
+        return None
+    if not all(binary in results for binary in binaries):
+        return None
+    return {binary: bool(results[binary]) for binary in binaries}
+
+
+def _store_cached_availability(cache_path: Path, path_hash: str, results: Dict[str, bool]):
+    """Best-effort write; a read-only home must not break the check"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"path_hash": path_hash, "results": results}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
 class ToolAvailabilityChecker:
     """Check which tools are installed on the system"""
     
@@ -31,10 +96,15 @@ class ToolAvailabilityChecker:
         return False
     
     @staticmethod
-    def check_all(tool_registry) -> Dict[str, bool]:
+    def check_all(tool_registry, cache_path: Optional[Path] = None, use_cache: bool = False) -> Dict[str, bool]:
         """
         Check availability of all tools in registry
         
+        Args:
+            cache_path: Results file (default: ~/.cache/sgpt/tool_avail.json)
+            use_cache: Opt in to reusing results for an unchanged PATH younger
+                than 5 minutes (a tool installed since then reads as missing)
+        
         Returns:
             Dict mapping binary name to availability status
         """
@@ -43,11 +113,30 @@ class ToolAvailabilityChecker:
         # Load tools if not already loaded
         tool_registry.load_tools()
         
+        path = os.environ.get("PATH", os.defpath)
+        
+        if use_cache:
+            binaries = [tool.spec.binary for tool in tool_registry.tools.values()]
+            cache_path = cache_path or _AVAIL_CACHE_PATH
+            path_hash = _path_hash(path)
+            cached = _load_cached_availability(cache_path, path_hash, binaries)
+            if cached is not None:
+                return cached
+        
+        # Scan PATH once, then look each binary up in the index
+        executables = _path_executables(path)
+        
         # Check each tool
-        for tool_name, tool in tool_registry._tools.items():
+        for tool_name, tool in tool_registry.tools.items():
             binary = tool.spec.binary
-            is_available = ToolAvailabilityChecker.check_binary(binary)
-            availability[binary] = is_available
+            if os.sep in binary or (os.altsep and os.altsep in binary):
+                availability[binary] = ToolAvailabilityChecker.check_binary(binary)
+                continue
+            found = executables.get(binary) or executables.get(binary + ".exe")
+            availability[binary] = found is not None and os.access(found, os.X_OK)
+        
+        if use_cache:
+            _store_cached_availability(cache_path, path_hash, availability)
         
         return availability
     
@@ -119,6 +119,10 @@ class ToolRegistry:
         """Get tool by name"""
         return self.tools.get(name)
     
+    def __getitem__(self, name: str) -> BaseTool:
+        """Get tool by name, raising KeyError if it is not registered"""
+        return self.tools[name]
+    
     def get_for_phase(self, phase: RedTeamPhase) -> list[ToolSpec]:
         """Get all tools available for a phase"""
         return [
@@ -4,7 +4,21 @@ Enhanced safety validation for commands
 """
 
 import re
-from typing import Tuple
+from typing import Sequence, Tuple
+
+
+def _compile_any(patterns: Sequence[str], flags: int = 0) -> re.Pattern:
+    """Compile patterns into one alternation; group p<i> marks patterns[i]"""
+    return re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)), flags)
+
+
+def _matched_pattern(regex: re.Pattern, patterns: Sequence[str], command: str):
+    """Return the source pattern of the first match, or None"""
+    match = regex.search(command)
+    return patterns[int(match.lastgroup[1:])] if match else None
+
+
+_PIPE_TO_INTERPRETER_RE = re.compile(r'\|\s*(bash|sh|python|perl|ruby)')
 
 
 class SafetyValidator:
@@ -56,6 +70,11 @@ class SafetyValidator:
         'find', 'locate', 'which',
     ]
     
+    # One search per pattern group instead of one per pattern
+    _DESTRUCTIVE_RE = _compile_any(DESTRUCTIVE_PATTERNS, re.IGNORECASE)
+    _PRIVESC_RE = _compile_any(PRIVESC_PATTERNS)
+    _EXFIL_RE = _compile_any(EXFIL_PATTERNS)
+    
     @staticmethod
     def validate(command: str) -> Tuple[bool, str]:
         """
@@ -66,14 +85,18 @@ class SafetyValidator:
         """
         
         # Check for destructive patterns
-        for pattern in SafetyValidator.DESTRUCTIVE_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                return (False, f"Destructive command detected: {pattern}")
+        pattern = _matched_pattern(
+            SafetyValidator._DESTRUCTIVE_RE, SafetyValidator.DESTRUCTIVE_PATTERNS, command
+        )
+        if pattern:
+            return (False, f"Destructive command detected: {pattern}")
         
         # Check for privilege escalation
-        for pattern in SafetyValidator.PRIVESC_PATTERNS:
-            if re.search(pattern, command):
-                return (False, f"Privilege escalation detected: {pattern}")
+        pattern = _matched_pattern(
+            SafetyValidator._PRIVESC_RE, SafetyValidator.PRIVESC_PATTERNS, command
+        )
+        if pattern:
+            return (False, f"Privilege escalation detected: {pattern}")
         
         # Extract binary name
         binary = command.split()[0] if command.split() else ""
@@ -90,7 +113,7 @@ class SafetyValidator:
             return (False, "Suspicious command execution pattern")
         
         # Check for pipe to interpreter
-        if re.search(r'\|\s*(bash|sh|python|perl|ruby)', command):
+        if _PIPE_TO_INTERPRETER_RE.search(command):
             return (False, "Piping to interpreter detected")
         
         return (True, "Command passed safety checks")
@@ -105,9 +128,11 @@ class SafetyValidator:
         """
         
         # Check for data exfiltration
-        for pattern in SafetyValidator.EXFIL_PATTERNS:
-            if re.search(pattern, command):
-                return (True, f"Data exfiltration pattern detected: {pattern}")
+        pattern = _matched_pattern(
+            SafetyValidator._EXFIL_RE, SafetyValidator.EXFIL_PATTERNS, command
+        )
+        if pattern:
+            return (True, f"Data exfiltration pattern detected: {pattern}")
         
         # Check for writes to important files
         important_paths = ['/etc/', '/var/', '/usr/', '/sys/', 'C:\\Windows', 'C:\\Program Files']
@@ -3,6 +3,7 @@ CrackMapExec Tool
 Network penetration testing and lateral movement
 """
 
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
@@ -51,6 +52,10 @@ class CrackMapExecTool(BaseTool):
                 password = cred.get('password', password)
                 break
         
+        target = shlex.quote(target)
+        username = shlex.quote(username)
+        password = shlex.quote(password)
+        
         if intent == "smb_enumeration":
             return f"crackmapexec smb {target}"
         
@@ -62,7 +67,7 @@ class CrackMapExecTool(BaseTool):
         
         elif intent == "execute_command":
             command = "whoami"
-            return f"crackmapexec smb {target} -u {username} -p {password} -x '{command}'"
+            return f"crackmapexec smb {target} -u {username} -p {password} -x {shlex.quote(command)}"
         
         return None
     
@@ -4,6 +4,7 @@ HTTP client for web requests and API testing
 """
 
 import re
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 
@@ -55,7 +56,7 @@ class CurlTool(BaseTool):
                     if "http" in service.lower():
                         ip = target["ip"]
                         protocol = "https" if "ssl" in service.lower() or port == 443 else "http"
-                        return f"curl -I -L -k {protocol}://{ip}:{port}"
+                        return f"curl -I -L -k {shlex.quote(f'{protocol}://{ip}:{port}')}"
             
             return None
         
@@ -71,7 +72,7 @@ class CurlTool(BaseTool):
                     if "http" in service.lower():
                         ip = target["ip"]
                         protocol = "https" if port == 443 else "http"
-                        return f"curl -v -s -k {protocol}://{ip}:{port} -o /dev/null"
+                        return f"curl -v -s -k {shlex.quote(f'{protocol}://{ip}:{port}')} -o /dev/null"
             
             return None
         
@@ -87,7 +88,7 @@ class CurlTool(BaseTool):
                     if "http" in service.lower():
                         ip = target["ip"]
                         protocol = "https" if port == 443 else "http"
-                        return f"curl -L -k {protocol}://{ip}:{port}"
+                        return f"curl -L -k {shlex.quote(f'{protocol}://{ip}:{port}')}"
             
             return None
         
@@ -103,7 +104,7 @@ class CurlTool(BaseTool):
                     if "http" in service.lower():
                         ip = target["ip"]
                         protocol = "https" if port == 443 else "http"
-                        return f"curl -s -k {protocol}://{ip}:{port}/api -H 'Accept: application/json'"
+                        return f"curl -s -k {shlex.quote(f'{protocol}://{ip}:{port}/api')} -H 'Accept: application/json'"
             
             return None
         
@@ -3,6 +3,7 @@ Enum4linux Tool
 SMB enumeration for Windows/Samba systems
 """
 
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
@@ -36,6 +37,8 @@ class Enum4linuxTool(BaseTool):
         if not target:
             return None
         
+        target = shlex.quote(target)
+        
         if intent == "enum_users":
             # Enumerate users
             return f"enum4linux -U {target}"
@@ -4,6 +4,7 @@ Directory and DNS brute-forcing tool
 """
 
 import re
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 
@@ -57,7 +58,7 @@ class GobusterTool(BaseTool):
                         protocol = "https" if port == 443 else "http"
                         # Use common wordlist
                         wordlist = "/usr/share/wordlists/dirb/common.txt"
-                        return f"gobuster dir -u {protocol}://{ip}:{port} -w {wordlist} -q -k"
+                        return f"gobuster dir -u {shlex.quote(f'{protocol}://{ip}:{port}')} -w {wordlist} -q -k"
             
             return None
         
@@ -74,7 +75,7 @@ class GobusterTool(BaseTool):
                         ip = target["ip"]
                         protocol = "https" if port == 443 else "http"
                         wordlist = "/usr/share/wordlists/dirb/common.txt"
-                        return f"gobuster dir -u {protocol}://{ip}:{port} -w {wordlist} -x php,html,txt -q -k"
+                        return f"gobuster dir -u {shlex.quote(f'{protocol}://{ip}:{port}')} -w {wordlist} -x php,html,txt -q -k"
             
             return None
         
@@ -91,7 +92,7 @@ class GobusterTool(BaseTool):
                     if "http" in service.lower():
                         protocol = "https" if port == 443 else "http"
                         wordlist = "/usr/share/wordlists/dirb/common.txt"
-                        return f"gobuster vhost -u {protocol}://{hostname}:{port} -w {wordlist} -q -k"
+                        return f"gobuster vhost -u {shlex.quote(f'{protocol}://{hostname}:{port}')} -w {wordlist} -q -k"
             
             return None
         
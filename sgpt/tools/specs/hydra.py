@@ -3,11 +3,16 @@ Hydra Tool
 Password brute-forcing for multiple protocols
 """
 
+import re
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
 
 
+_HYDRA_ATTEMPT_RE = re.compile(r'attempt', re.IGNORECASE)
+
+
 class HydraTool(BaseTool):
     """Password brute-forcing using hydra"""
     
@@ -37,26 +42,26 @@ class HydraTool(BaseTool):
             return None
         
         # Check for credentials wordlist
-        wordlist = context.get("wordlist", "/usr/share/wordlists/rockyou.txt")
-        username = context.get("username", "admin")
+        wordlist = shlex.quote(context.get("wordlist", "/usr/share/wordlists/rockyou.txt"))
+        username = shlex.quote(context.get("username", "admin"))
         
         if intent == "ssh_brute":
             # SSH brute-force
-            return f"hydra -l {username} -P {wordlist} ssh://{target} -t 4"
+            return f"hydra -l {username} -P {wordlist} {shlex.quote(f'ssh://{target}')} -t 4"
         
         elif intent == "ftp_brute":
             # FTP brute-force
-            return f"hydra -l {username} -P {wordlist} ftp://{target} -t 4"
+            return f"hydra -l {username} -P {wordlist} {shlex.quote(f'ftp://{target}')} -t 4"
         
         elif intent == "http_brute":
             # HTTP basic auth
             # Format: hydra -l user -P pass.txt target http-get /path
             path = context.get("path", "/")
-            return f"hydra -l {username} -P {wordlist} {target} http-get {path} -t 4"
+            return f"hydra -l {username} -P {wordlist} {shlex.quote(target)} http-get {shlex.quote(path)} -t 4"
         
         elif intent == "rdp_brute":
             # RDP brute-force
-            return f"hydra -l {username} -P {wordlist} rdp://{target} -t 1"
+            return f"hydra -l {username} -P {wordlist} {shlex.quote(f'rdp://{target}')} -t 1"
         
         return None
     
@@ -122,7 +127,7 @@ class HydraTool(BaseTool):
                         facts["success"] = True
             
             # Count attempts
-            if "attempt" in line.lower():
+            if _HYDRA_ATTEMPT_RE.search(line):
                 try:
                     # Extract number
                     parts = line.split()
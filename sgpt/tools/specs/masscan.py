@@ -3,6 +3,7 @@ Masscan Tool
 Ultra-fast port scanner
 """
 
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
@@ -40,6 +41,8 @@ class MasscanTool(BaseTool):
             
         if not target:
             return None
+        
+        target = shlex.quote(target)
             
         if intent == "fast_port_scan":
             ports = "80,443,8080,22,21,3389"
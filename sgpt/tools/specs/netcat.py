@@ -3,6 +3,7 @@ Netcat Tool
 Swiss army knife for networking
 """
 
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
@@ -36,6 +37,9 @@ class NetcatTool(BaseTool):
             target = facts['live_hosts'][0]
         elif context.get('target'):
             target = context['target']
+        
+        if target:
+            target = shlex.quote(target)
             
         port = "80"
         
@@ -3,11 +3,24 @@ Nikto Tool Implementation
 Web server vulnerability scanner
 """
 
+import io
 import re
+import shlex
+from functools import lru_cache
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase, Vulnerability
 
 
+# Finding lines: + OSVDB-XXXX: /path: Description  or  + CVE-YYYY-NNNN: ...
+# Anchored and length-bounded so hostile banners can't trigger backtracking;
+# over-long descriptions are truncated rather than dropped.
+_NIKTO_VULN_RE = re.compile(
+    r'\A\+ (?P<osvdb>OSVDB-\d{1,10}|CVE-\d{4}-\d{4,7}):[ \t]*(?P<desc>[^\r\n]{1,512})'
+)
+
+_HTTPS_PORTS = frozenset({443, 8443})
+
+
 class NiktoTool(BaseTool):
     """Nikto web vulnerability scanner"""
     
@@ -32,6 +45,12 @@ class NiktoTool(BaseTool):
         ]
     )
     
+    def __init__(self):
+        self._handlers = {
+            "web_vuln_scan": self._gen_web_vuln_scan,
+            "quick_web_scan": self._gen_quick_web_scan,
+        }
+    
     def generate_command(
         self,
         intent: str,
@@ -39,39 +58,52 @@ class NiktoTool(BaseTool):
         facts: dict
     ) -> str:
         """Generate nikto command based on intent"""
-        
-        if intent == "web_vuln_scan":
-            # Vulnerability scan on web service
-            targets = facts.get("targets", [])
-            if not targets:
-                return None
-            
-            for target in targets:
-                services = target.get("services", {})
-                for port, service in services.items():
-                    if "http" in service.lower():
-                        ip = target["ip"]
-                        ssl_flag = "-ssl" if ("ssl" in service.lower() or port == 443) else "-nossl"
-                        return f"nikto -h {ip} -p {port} {ssl_flag} -Tuning x 6"
-            
+        handler = self._handlers.get(intent)
+        return handler(context, facts) if handler else None
+    
+    def _gen_web_vuln_scan(self, context: dict, facts: dict) -> str:
+        # Vulnerability scan on web service
+        first = self._first_http_service(facts)
+        if not first:
             return None
         
-        elif intent == "quick_web_scan":
-            # Quick scan
-            targets = facts.get("targets", [])
-            if not targets:
-                return None
-            
-            for target in targets:
-                services = target.get("services", {})
-                for port, service in services.items():
-                    if "http" in service.lower():
-                        ip = target["ip"]
-                        return f"nikto -h {ip}:{port} -Tuning 1 2 3"
-            
+        ip, port, svc_lower = first
+        return self._nikto_cmd(ip, port, "ssl" in svc_lower or port in _HTTPS_PORTS)
+    
+    def _gen_quick_web_scan(self, context: dict, facts: dict) -> str:
+        # Quick scan
+        first = self._first_http_service(facts)
+        if not first:
             return None
         
-        return None
+        ip, port, _ = first
+        return self._nikto_quick_cmd(ip, port)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _nikto_cmd(ip: str, port, ssl: bool) -> str:
+        ssl_flag = "-ssl" if ssl else "-nossl"
+        return f"nikto -h {shlex.quote(ip)} -p {shlex.quote(str(port))} {ssl_flag} -Tuning x 6"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _nikto_quick_cmd(ip: str, port) -> str:
+        return f"nikto -h {shlex.quote(f'{ip}:{port}')} -Tuning 1 2 3"
+    
+    def _first_http_service(self, facts: dict):
+        """Return (ip, port, lowercased service) of the first HTTP service, or None"""
+        return next(
+            (
+                (target["ip"], port, svc_lower)
+                for target in facts.get("targets", [])
+                for port, svc_lower in (
+                    (port, service.lower())
+                    for port, service in target.get("services", {}).items()
+                )
+                if "http" in svc_lower
+            ),
+            None
+        )
     
     def parse_output(self, output: str) -> dict:
         """Parse nikto output to extract vulnerabilities"""
@@ -82,16 +114,16 @@ class NiktoTool(BaseTool):
         
         # Parse findings
         # Format: + OSVDB-XXXX: /path: Description
-        for line in output.split("\n"):
+        for line in io.StringIO(output):
+            line = line.rstrip("\n")
             if line.startswith("+ "):
                 # Extract vulnerability info
-                vuln_match = re.search(r'\+ (?:OSVDB-(\d+)|CVE-[\d-]+):\s*(.+)', line)
+                vuln_match = _NIKTO_VULN_RE.match(line)
                 if vuln_match:
-                    vuln_id = vuln_match.group(1) if vuln_match.group(1) else "Unknown"
-                    description = vuln_match.group(2).strip()
+                    description = vuln_match["desc"].strip()
                     
                     facts["vulnerabilities"].append({
-                        "cve_id": f"OSVDB-{vuln_id}",
+                        "cve_id": vuln_match["osvdb"],
                         "name": "Nikto Finding",
                         "severity": "medium",  # Default
                         "description": description,
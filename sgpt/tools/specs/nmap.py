@@ -4,10 +4,25 @@ Network discovery and port scanning
 """
 
 import re
+import shlex
+from functools import lru_cache
+from typing import Union
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase, Target
 
 
+# Host report lines and open-port lines, matched in a single pass.
+# Quantifiers are capped (DNS name <= 253, port <= 5 digits) since scanned
+# hosts control part of this output.
+_NMAP_COMBINED_RE = re.compile(
+    r"(?P<host>Nmap scan report for (?:[\w\.-]{1,253} \()?"
+    r"(?P<ip>\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}))"
+    r"|(?P<port>(?P<portnum>\d{1,5})/(?:tcp|udp)[ \t]{1,32}open[ \t]{1,32}(?P<svc>[\w\-]{1,64}))"
+)
+# Same pattern for raw subprocess bytes, so output needn't be decoded first
+_NMAP_COMBINED_BYTES_RE = re.compile(_NMAP_COMBINED_RE.pattern.encode())
+
+
 class NmapTool(BaseTool):
     """Nmap network scanner"""
     
@@ -36,6 +51,15 @@ class NmapTool(BaseTool):
         ]
     )
     
+    def __init__(self):
+        self._handlers = {
+            "host_discovery": self._gen_host_discovery,
+            "port_scan_quick": self._gen_port_scan_quick,
+            "port_scan_full": self._gen_port_scan_full,
+            "service_detection": self._gen_service_detection,
+            "os_detection": self._gen_os_detection,
+        }
+    
     def generate_command(
         self,
         intent: str,
@@ -43,61 +67,68 @@ class NmapTool(BaseTool):
         facts: dict
     ) -> str:
         """Generate nmap command based on intent"""
+        handler = self._handlers.get(intent)
+        return handler(context, facts) if handler else None
+    
+    def _gen_host_discovery(self, context: dict, facts: dict) -> str:
+        # Ping scan to find live hosts
+        subnet = context.get("network", {}).get("subnet", "192.168.0.0/24")
+        return self._nmap_cmd("-sn", subnet)
+    
+    def _gen_port_scan_quick(self, context: dict, facts: dict) -> str:
+        # Quick port scan on discovered hosts
+        hosts = facts.get("live_hosts", [])
+        if not hosts:
+            return None
         
-        if intent == "host_discovery":
-            # Ping scan to find live hosts
-            subnet = context.get("network", {}).get("subnet", "192.168.0.0/24")
-            return f"nmap -sn {subnet}"
+        target = hosts[0]  # Start with first host
+        return self._nmap_cmd("-sS --top-ports 100", target)
+    
+    def _gen_port_scan_full(self, context: dict, facts: dict) -> str:
+        # Full port scan
+        hosts = facts.get("live_hosts", [])
+        if not hosts:
+            return None
         
-        elif intent == "port_scan_quick":
-            # Quick port scan on discovered hosts
-            hosts = facts.get("live_hosts", [])
-            if not hosts:
-                return None
-            
-            target = hosts[0]  # Start with first host
-            return f"nmap -sS --top-ports 100 {target}"
+        target = hosts[0]
+        return self._nmap_cmd("-sS -p-", target)
+    
+    def _gen_service_detection(self, context: dict, facts: dict) -> str:
+        # Service version detection
+        targets = facts.get("targets", [])
+        if not targets:
+            return None
         
-        elif intent == "port_scan_full":
-            # Full port scan
-            hosts = facts.get("live_hosts", [])
-            if not hosts:
-                return None
-            
-            target = hosts[0]
-            return f"nmap -sS -p- {target}"
+        target_data = targets[0]
+        ip = target_data["ip"]
+        ports = target_data.get("ports", [])
         
-        elif intent == "service_detection":
-            # Service version detection
-            targets = facts.get("targets", [])
-            if not targets:
-                return None
-            
-            target_data = targets[0]
-            ip = target_data["ip"]
-            ports = target_data.get("ports", [])
-            
-            if not ports:
-                return f"nmap -sV {ip}"
-            
-            port_list = ",".join(map(str, ports[:20]))  # Limit to first 20
-            return f"nmap -sV -p {port_list} {ip}"
+        if not ports:
+            return self._nmap_cmd("-sV", ip)
         
-        elif intent == "os_detection":
-            # OS fingerprinting
-            hosts = facts.get("live_hosts", [])
-            if not hosts:
-                return None
-            
-            target = hosts[0]
-            return f"nmap -O {target}"
+        port_list = ",".join(map(str, ports[:20]))  # Limit to first 20
+        return self._nmap_cmd(f"-sV -p {port_list}", ip)
+    
+    def _gen_os_detection(self, context: dict, facts: dict) -> str:
+        # OS fingerprinting
+        hosts = facts.get("live_hosts", [])
+        if not hosts:
+            return None
         
-        return None
+        target = hosts[0]
+        return self._nmap_cmd("-O", target)
     
-    def parse_output(self, output: str) -> dict:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _nmap_cmd(flags: str, target: str) -> str:
+        return f"nmap {flags} {shlex.quote(target)}"
+    
+    def parse_output(self, output: Union[str, bytes]) -> dict:
         """
         Parse nmap output to extract facts
         
+        Accepts str or raw bytes; with bytes only the matched fields are decoded.
+        
         Returns dict with:
         - hosts: list of discovered IPs
         - targets: list of target dicts with ports/services
@@ -107,38 +138,38 @@ class NmapTool(BaseTool):
             "targets": []
         }
         
-        # Parse host discovery (-sn)
-        host_pattern = r"Nmap scan report for (?:[\w\.-]+ \()?(\d+\.\d+\.\d+\.\d+)"
-        for match in re.finditer(host_pattern, output):
-            ip = match.group(1)
-            if ip not in facts["hosts"]:
-                facts["hosts"].append(ip)
-        
-        # Parse open ports
-        port_pattern = r"(\d+)/(tcp|udp)\s+open\s+([\w\-]+)"
-        
-        current_ip = None
         current_target = None
+        seen_hosts = set()
+        
+        is_bytes = isinstance(output, (bytes, bytearray))
+        regex = _NMAP_COMBINED_BYTES_RE if is_bytes else _NMAP_COMBINED_RE
         
-        for line in output.split("\n"):
-            # Track current host
-            host_match = re.search(host_pattern, line)
-            if host_match:
-                current_ip = host_match.group(1)
+        for match in regex.finditer(output):
+            ip = match["ip"]
+            if ip:
+                if is_bytes:
+                    ip = ip.decode("ascii")
+                
+                # Host discovery (-sn) and start of a new host block
+                if ip not in seen_hosts:
+                    seen_hosts.add(ip)
+                    facts["hosts"].append(ip)
+                
+                if current_target and current_target["ports"]:
+                    facts["targets"].append(current_target)
+                
                 current_target = {
-                    "ip": current_ip,
+                    "ip": ip,
                     "ports": [],
                     "services": {}
                 }
             
-            # Parse ports
-            port_match = re.search(port_pattern, line)
-            if port_match and current_target:
-                port = int(port_match.group(1))
-                service = port_match.group(3)
+            elif match["portnum"] and current_target:
+                port = int(match["portnum"])
                 
                 current_target["ports"].append(port)
-                current_target["services"][port] = service
+                svc = match["svc"]
+                current_target["services"][port] = svc.decode("ascii") if is_bytes else svc
         
         if current_target and current_target["ports"]:
             facts["targets"].append(current_target)
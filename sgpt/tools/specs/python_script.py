@@ -3,11 +3,95 @@ Python Script Tool
 Generates and executes custom Python scripts for red-team tasks
 """
 
+import io
 import json
+import re
+import shlex
+from functools import lru_cache
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 
 
+# Output lines printed by the generated scripts
+_PYSCRIPT_PORT_RE = re.compile(r'^Port (\d{1,5}):\s*(.+)$')
+_PYSCRIPT_UP_RE = re.compile(r'^(\d+\.\d+\.\d+\.\d+) - UP$')
+
+
+# Script templates, joined once at import and filled in with %-formatting
+# per call (keeps the generated scripts' own f-string braces unescaped)
+_BANNER_SCRIPT_TMPL = '\n'.join([
+    '',
+    'import socket',
+    'target = %r',
+    'ports = [21, 22, 23, 25, 80, 443, 3306, 5432, 8080]',
+    'for port in ports:',
+    '    try:',
+    '        s = socket.socket()',
+    '        s.settimeout(2)',
+    '        s.connect((target, port))',
+    '        banner = s.recv(1024).decode().strip()',
+    '        if banner:',
+    '            print(f"Port {port}: {banner[:100]}")',
+    '        s.close()',
+    '    except:',
+    '        pass',
+    '',
+])
+
+_HTTP_SCANNER_TMPL = '\n'.join([
+    '',
+    'import requests',
+    'targets = %s',
+    'for ip in targets:',
+    '    for port in [80, 443, 8080, 8443]:',
+    '        for proto in ["http", "https"]:',
+    '            try:',
+    '                r = requests.get(f"{proto}://{ip}:{port}", timeout=3, verify=False)',
+    '                print(f"{proto}://{ip}:{port} - {r.status_code} {r.headers.get(\'Server\', \'\')}")',
+    '            except:',
+    '                pass',
+    '',
+])
+
+
+@lru_cache(maxsize=32)
+def _json_ips(ips: tuple) -> str:
+    """JSON-encode a target IP list; fact sets are stable across a session"""
+    return json.dumps(list(ips))
+
+
+# Pings the /24 with 64 workers instead of one host at a time
+# (254 serial pings at 500ms is ~2 minutes worst case)
+_SUBNET_TMPL = '\n'.join([
+    '',
+    'import os',
+    'import subprocess',
+    'import concurrent.futures',
+    'args = ["-n", "1", "-w", "500"] if os.name == "nt" else ["-c", "1", "-W", "1"]',
+    'def ping(ip):',
+    '    result = subprocess.run(["ping", *args, ip], ',
+    '                          capture_output=True, text=True)',
+    '    if "ttl=" in result.stdout.lower():',
+    '        print(f"{ip} - UP", flush=True)',
+    'base = %r',
+    'with concurrent.futures.ThreadPoolExecutor(max_workers=64) as ex:',
+    '    list(ex.map(ping, [f"{base}.{i}" for i in range(1, 255)]))',
+    '',
+])
+
+# No parameters, so the full command is built once
+_DATA_EXFIL_SCRIPT = '\n'.join([
+    '',
+    'import base64',
+    'import sys',
+    'data = sys.stdin.read()',
+    'encoded = base64.b64encode(data.encode()).decode()',
+    'print(encoded)',
+    '',
+])
+_DATA_EXFIL_CMD = f'python -c {shlex.quote(_DATA_EXFIL_SCRIPT)}'
+
+
 class PythonScriptTool(BaseTool):
     """Python script generator and executor"""
     
@@ -29,6 +113,14 @@ class PythonScriptTool(BaseTool):
         safe_flags=["-c", "-m"]
     )
     
+    def __init__(self):
+        self._handlers = {
+            "port_banner_grab": self._gen_port_banner_grab,
+            "http_scanner": self._gen_http_scanner,
+            "subnet_scanner": self._gen_subnet_scanner,
+            "data_exfil_prep": self._gen_data_exfil_prep,
+        }
+    
     def generate_command(
         self,
         intent: str,
@@ -36,83 +128,40 @@ class PythonScriptTool(BaseTool):
         facts: dict
     ) -> str:
         """Generate Python script command based on intent"""
+        handler = self._handlers.get(intent)
+        return handler(context, facts) if handler else None
+    
+    def _gen_port_banner_grab(self, context: dict, facts: dict) -> str:
+        # Custom banner grabbing script
+        hosts = facts.get("live_hosts", [])
+        if not hosts:
+            return None
         
-        if intent == "port_banner_grab":
-            # Custom banner grabbing script
-            hosts = facts.get("live_hosts", [])
-            if not hosts:
-                return None
-            
-            target = hosts[0]
-            script = f'''
-import socket
-target = "{target}"
-ports = [21, 22, 23, 25, 80, 443, 3306, 5432, 8080]
-for port in ports:
-    try:
-        s = socket.socket()
-        s.settimeout(2)
-        s.connect((target, port))
-        banner = s.recv(1024).decode().strip()
-        if banner:
-            print(f"Port {{port}}: {{banner[:100]}}")
-        s.close()
-    except:
-        pass
-'''
-            return f'python -c "{script}"'
-        
-        elif intent == "http_scanner":
-            # HTTP service scanner
-            targets = facts.get("targets", [])
-            if not targets:
-                return None
-            
-            target_list = [t["ip"] for t in targets]
-            script = f'''
-import requests
-targets = {json.dumps(target_list)}
-for ip in targets:
-    for port in [80, 443, 8080, 8443]:
-        for proto in ["http", "https"]:
-            try:
-                r = requests.get(f"{{proto}}://{{ip}}:{{port}}", timeout=3, verify=False)
-                print(f"{{proto}}://{{ip}}:{{port}} - {{r.status_code}} {{r.headers.get('Server', '')}}")
-            except:
-                pass
-'''
-            return f'python -c "{script}"'
-        
-        elif intent == "subnet_scanner":
-            # Quick subnet scanner
-            subnet = context.get("network", {}).get("subnet", "192.168.0.0/24")
-            subnet_base = ".".join(subnet.split(".")[:3])
-            
-            script = f'''
-import subprocess
-import concurrent.futures
-def ping(ip):
-    result = subprocess.run(["ping", "-n", "1", "-w", "500", ip], 
-                          capture_output=True, text=True)
-    if "TTL=" in result.stdout:
-        print(f"{{ip}} - UP")
-for i in range(1, 255):
-    ping(f"{subnet_base}.{{i}}")
-'''
-            return f'python -c "{script}"'
+        target = hosts[0]
+        script = _BANNER_SCRIPT_TMPL % (target,)
+        return f'python -c {shlex.quote(script)}'
+    
+    def _gen_http_scanner(self, context: dict, facts: dict) -> str:
+        # HTTP service scanner
+        targets = facts.get("targets", [])
+        if not targets:
+            return None
         
-        elif intent == "data_exfil_prep":
-            # Prepare data for exfiltration (base64 encode)
-            script = '''
-import base64
-import sys
-data = sys.stdin.read()
-encoded = base64.b64encode(data.encode()).decode()
-print(encoded)
-'''
-            return f'python -c "{script}"'
+        target_list = [t["ip"] for t in targets]
+        script = _HTTP_SCANNER_TMPL % _json_ips(tuple(target_list))
+        return f'python -c {shlex.quote(script)}'
+    
+    def _gen_subnet_scanner(self, context: dict, facts: dict) -> str:
+        # Quick subnet scanner
+        subnet = context.get("network", {}).get("subnet", "192.168.0.0/24")
+        subnet_base = ".".join(subnet.split(".")[:3])
         
-        return None
+        script = _SUBNET_TMPL % (subnet_base,)
+        return f'python -c {shlex.quote(script)}'
+    
+    def _gen_data_exfil_prep(self, context: dict, facts: dict) -> str:
+        # Prepare data for exfiltration (base64 encode)
+        return _DATA_EXFIL_CMD
     
     def parse_output(self, output: str) -> dict:
         """Parse Python script output"""
@@ -122,19 +171,24 @@ print(encoded)
             "services": {}
         }
         
-        # Parse "IP - UP" format from subnet scanner
-        for line in output.split("\n"):
-            if " - UP" in line:
-                ip = line.split(" - ")[0].strip()
-                facts["hosts"].append(ip)
+        seen_hosts = set()
+        
+        for line in io.StringIO(output):
+            line = line.strip()
+            
+            # Parse "IP - UP" format from subnet scanner
+            up_match = _PYSCRIPT_UP_RE.match(line)
+            if up_match:
+                ip = up_match[1]
+                if ip not in seen_hosts:
+                    seen_hosts.add(ip)
+                    facts["hosts"].append(ip)
+                continue
             
             # Parse "Port X: banner" format
-            if "Port " in line and ":" in line:
-                parts = line.split(":", 1)
-                if len(parts) == 2:
-                    port_part = parts[0].replace("Port", "").strip()
-                    banner = parts[1].strip()
-                    # Would need IP context to properly store
-                    facts["services"][port_part] = banner
+            port_match = _PYSCRIPT_PORT_RE.match(line)
+            if port_match:
+                # Would need IP context to properly store
+                facts["services"][port_match[1]] = port_match[2].strip()
         
         return facts
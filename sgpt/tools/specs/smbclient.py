@@ -3,11 +3,18 @@ SMBClient Tool
 Interact with SMB shares and perform file operations
 """
 
+import io
+import re
+import shlex
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
 
 
+# Share listing rows: <name> <Disk|IPC|Printer> [comment]
+_SMB_SHARE_RE = re.compile(r'^\s*(\S+)\s+(Disk|IPC|Printer)\b\s*(.*)$')
+
+
 class SMBClientTool(BaseTool):
     """SMBClient for SMB interaction and file operations"""
     
@@ -23,6 +30,14 @@ class SMBClientTool(BaseTool):
         safe_flags=["-L", "-N", "-U", "-c"]
     )
     
+    def __init__(self):
+        self._handlers = {
+            "list_shares": self._gen_list_shares,
+            "list_files": self._gen_list_files,
+            "download_file": self._gen_download_file,
+            "check_access": self._gen_check_access,
+        }
+    
     def generate_command(
         self,
         intent: str,
@@ -31,6 +46,10 @@ class SMBClientTool(BaseTool):
     ) -> str:
         """Generate smbclient command"""
         
+        handler = self._handlers.get(intent)
+        if not handler:
+            return None
+        
         # Extract target from facts
         target = None
         if facts.get('live_hosts'):
@@ -54,40 +73,37 @@ class SMBClientTool(BaseTool):
                     password = cred.get('password', password)
                     break
         
-        if intent == "list_shares":
-            cmd = f"smbclient -L //{target}"
-            if username != "guest" or password:
-                cmd += f" -U {username}"
-                if password:
-                    cmd += f"%{password}"
-            else:
-                cmd += " -N"
-            return cmd
+        return handler(context, target, username, password)
+    
+    def _gen_list_shares(self, context: dict, target: str, username: str, password: str) -> str:
+        cmd = f"smbclient -L {shlex.quote(f'//{target}')}"
+        if username != "guest" or password:
+            user = f"{username}%{password}" if password else username
+            cmd += f" -U {shlex.quote(user)}"
+        else:
+            cmd += " -N"
+        return cmd
+    
+    def _gen_list_files(self, context: dict, target: str, username: str, password: str) -> str:
+        share = context.get('share', 'IPC$')
+        directory = context.get('directory')
         
-        elif intent == "list_files":
-            share = context.get('share', 'IPC$')
-            directory = context.get('directory')
+        cmd_str = "ls"
+        if directory:
+            cmd_str = f"cd {directory}; ls"
             
-            cmd_str = "ls"
-            if directory:
-                cmd_str = f"cd {directory}; ls"
-                
-            cmd = f"smbclient //{target}/{share} -U {username} -c '{cmd_str}'"
-            return cmd
-        
-        elif intent == "download_file":
-            share = context.get('share', 'Users')
-            remote_file = context.get('remote_file', 'flag.txt')
-            local_file = context.get('local_file', 'flag.txt')
-            cmd = f"smbclient //{target}/{share} -U {username} -c 'get {remote_file} {local_file}'"
-            return cmd
-        
-        elif intent == "check_access":
-            share = context.get('share', 'IPC$')
-            cmd = f"smbclient //{target}/{share} -N -c 'ls'"
-            return cmd
-        
-        return None
+        return f"smbclient {shlex.quote(f'//{target}/{share}')} -U {shlex.quote(username)} -c {shlex.quote(cmd_str)}"
+    
+    def _gen_download_file(self, context: dict, target: str, username: str, password: str) -> str:
+        share = context.get('share', 'Users')
+        remote_file = context.get('remote_file', 'flag.txt')
+        local_file = context.get('local_file', 'flag.txt')
+        payload = f"get {remote_file} {local_file}"
+        return f"smbclient {shlex.quote(f'//{target}/{share}')} -U {shlex.quote(username)} -c {shlex.quote(payload)}"
+    
+    def _gen_check_access(self, context: dict, target: str, username: str, password: str) -> str:
+        share = context.get('share', 'IPC$')
+        return f"smbclient {shlex.quote(f'//{target}/{share}')} -N -c 'ls'"
     
     def parse_output(self, output: str) -> Dict[str, Any]:
         """Parse smbclient output into structured facts"""
@@ -97,18 +113,15 @@ class SMBClientTool(BaseTool):
         # Parse share listing
         if 'Sharename' in output and 'Type' in output and 'Comment' in output:
             shares = []
-            lines = output.split('\n')
-            for line in lines:
-                if 'Disk' in line or 'IPC' in line or 'Printer' in line:
-                    parts = line.split()
-                    if parts:
-                        share_name = parts[0]
-                        share_type = 'Disk' if 'Disk' in line else ('IPC' if 'IPC' in line else 'Printer')
-                        shares.append({
-                            'name': share_name,
-                            'type': share_type,
-                            'comment': ' '.join(parts[2:]) if len(parts) > 2 else ''
-                        })
+            for line in io.StringIO(output):
+                match = _SMB_SHARE_RE.match(line)
+                if match:
+                    share_name, share_type, comment = match.groups()
+                    shares.append({
+                        'name': share_name,
+                        'type': share_type,
+                        'comment': comment.strip()
+                    })
             facts['shares'] = shares
         
         return facts
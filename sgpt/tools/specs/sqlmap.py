@@ -3,11 +3,25 @@ SQLMap Tool
 Automated SQL injection detection and exploitation
 """
 
+import re
+import shlex
+from functools import lru_cache
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
 
 
+_SQLMAP_VULN_RE = re.compile(r'is vulnerable|sqlmap identified', re.IGNORECASE)
+_SQLMAP_INJ_RE = re.compile(r'(boolean-based blind|time-based blind|error-based|UNION query)')
+# "available databases [N]:" header followed by a block of non-blank lines
+# (at most 512 of them, so hostile output can't make the scan unbounded)
+_SQLMAP_DB_RE = re.compile(
+    r'available databases[^\n]*\n((?:[ \t]*\S[^\n]*(?:\n|\Z)){0,512})',
+    re.IGNORECASE
+)
+_SQLMAP_DB_ITEM_RE = re.compile(r'^[ \t]*\[\*\][ \t]*(.+?)\s*$', re.MULTILINE)
+
+
 class SQLMapTool(BaseTool):
     """SQLMap for SQL injection testing"""
     
@@ -23,6 +37,14 @@ class SQLMapTool(BaseTool):
         safe_flags=["-u", "--batch", "--dbs", "--tables"]
     )
     
+    def __init__(self):
+        self._handlers = {
+            "test_injection": self._gen_test_injection,
+            "enumerate_databases": self._gen_enumerate_databases,
+            "dump_tables": self._gen_dump_tables,
+            "command_execution": self._gen_command_execution,
+        }
+    
     def generate_command(
         self,
         intent: str,
@@ -31,6 +53,10 @@ class SQLMapTool(BaseTool):
     ) -> str:
         """Generate sqlmap command"""
         
+        handler = self._handlers.get(intent)
+        if not handler:
+            return None
+        
         # Extract URL
         url = None
         if context.get('url'):
@@ -40,25 +66,30 @@ class SQLMapTool(BaseTool):
             
         if not url:
             return None
-            
-        if intent == "test_injection":
-            cmd = f"sqlmap -u '{url}' --batch --level=1 --risk=1"
-            return cmd
-        
-        elif intent == "enumerate_databases":
-            cmd = f"sqlmap -u '{url}' --dbs --batch"
-            return cmd
-        
-        elif intent == "dump_tables":
-            database = "users" # Default guess
-            cmd = f"sqlmap -u '{url}' -D {database} --dump-all --batch"
-            return cmd
         
-        elif intent == "command_execution":
-            command = "whoami"
-            return f"sqlmap -u '{url}' --os-cmd='{command}' --batch"
-        
-        return None
+        return handler(url)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_test_injection(url: str) -> str:
+        return f"sqlmap -u {shlex.quote(url)} --batch --level=1 --risk=1"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_enumerate_databases(url: str) -> str:
+        return f"sqlmap -u {shlex.quote(url)} --dbs --batch"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_dump_tables(url: str) -> str:
+        database = "users" # Default guess
+        return f"sqlmap -u {shlex.quote(url)} -D {database} --dump-all --batch"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_command_execution(url: str) -> str:
+        command = "whoami"
+        return f"sqlmap -u {shlex.quote(url)} --os-cmd={shlex.quote(command)} --batch"
     
     
     def parse_output(self, output: str) -> Dict[str, Any]:
@@ -67,30 +98,14 @@ class SQLMapTool(BaseTool):
         facts = {}
         
         # Check for injection
-        if 'is vulnerable' in output.lower() or 'sqlmap identified' in output.lower():
+        if _SQLMAP_VULN_RE.search(output):
             facts['vulnerable'] = True
-            facts['injection_type'] = []
-            
-            if 'boolean-based blind' in output:
-                facts['injection_type'].append('boolean-based blind')
-            if 'time-based blind' in output:
-                facts['injection_type'].append('time-based blind')
-            if 'error-based' in output:
-                facts['injection_type'].append('error-based')
-            if 'UNION query' in output:
-                facts['injection_type'].append('UNION query')
+            # Unique injection types, in order of first appearance
+            facts['injection_type'] = list(dict.fromkeys(_SQLMAP_INJ_RE.findall(output)))
         
         # Database enumeration
-        if 'available databases' in output.lower():
-            facts['databases'] = []
-            lines = output.split('\n')
-            in_db_section = False
-            
-            for line in lines:
-                if 'available databases' in line.lower():
-                    in_db_section = True
-                elif in_db_section and line.strip().startswith('[*]'):
-                    db_name = line.strip()[3:].strip()
-                    facts['databases'].append(db_name)
+        db_section = _SQLMAP_DB_RE.search(output)
+        if db_section:
+            facts['databases'] = _SQLMAP_DB_ITEM_RE.findall(db_section[1])
         
         return facts
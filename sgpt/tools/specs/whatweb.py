@@ -3,11 +3,29 @@ WhatWeb Tool
 Web technology fingerprinting and detection
 """
 
+import io
+import re
+import shlex
+from functools import lru_cache
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
 from typing import Dict, Any
 
 
+# Technology[version] tokens, e.g. Apache[2.4.41]; lengths capped against
+# hostile banners
+_WHATWEB_TECH_RE = re.compile(r'(\w{1,64})\[([^\]]{0,128})\]')
+
+# Technology categories (lowercase names)
+_WHATWEB_SERVERS = frozenset({'apache', 'nginx', 'iis', 'lighttpd'})
+_WHATWEB_CMS = frozenset({'wordpress', 'joomla', 'drupal'})
+_WHATWEB_LANGS = frozenset({'php', 'python', 'ruby', 'asp.net'})
+_WHATWEB_FW = frozenset({'jquery', 'bootstrap', 'react', 'vue', 'angular'})
+
+# Well-known web ports and their scheme
+_PORT_PROTOCOL = {80: 'http', 8080: 'http', 8000: 'http', 443: 'https', 8443: 'https'}
+
+
 class WhatWebTool(BaseTool):
     """Web technology detection using WhatWeb"""
     
@@ -27,27 +45,44 @@ class WhatWebTool(BaseTool):
         "aggressive_scan"      # Aggressive fingerprinting
     ]
     
+    def __init__(self):
+        self._handlers = {
+            "web_fingerprint": self._gen_web_fingerprint,
+            "tech_detection": self._gen_tech_detection,
+            "aggressive_scan": self._gen_aggressive_scan,
+        }
+    
     def generate_command(self, intent: str, context: Dict, facts: Dict) -> str:
         """Generate whatweb command"""
         
+        handler = self._handlers.get(intent)
+        if not handler:
+            return None
+        
         # Get target URL
         url = self._get_web_target(context, facts)
         if not url:
             return None
         
-        if intent == "web_fingerprint":
-            # Basic fingerprinting
-            return f"whatweb {url}"
-        
-        elif intent == "tech_detection":
-            # Verbose detection
-            return f"whatweb -v {url}"
-        
-        elif intent == "aggressive_scan":
-            # Aggressive mode
-            return f"whatweb -a 3 {url}"
-        
-        return None
+        return handler(url)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_web_fingerprint(url: str) -> str:
+        # Basic fingerprinting
+        return f"whatweb {shlex.quote(url)}"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_tech_detection(url: str) -> str:
+        # Verbose detection
+        return f"whatweb -v {shlex.quote(url)}"
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _gen_aggressive_scan(url: str) -> str:
+        # Aggressive mode
+        return f"whatweb -a 3 {shlex.quote(url)}"
     
     def _get_web_target(self, context: Dict, facts: Dict) -> str:
         """Get web target URL"""
@@ -63,22 +98,27 @@ class WhatWebTool(BaseTool):
                 return f"http://{target}"
             return target
         
-        # Check facts for web services
-        if "targets" in facts:
-            for target in facts["targets"]:
-                services = target.get("services", {})
-                
-                # Look for HTTP ports
-                for port, service in services.items():
-                    port_num = int(port) if isinstance(port, str) else port
-                    
-                    if port_num in [80, 8080, 8000]:
-                        return f"http://{target['ip']}:{port_num}"
-                    elif port_num == 443:
-                        return f"https://{target['ip']}:{port_num}"
-                    elif "http" in service.lower():
-                        protocol = "https" if "ssl" in service.lower() or port_num == 443 else "http"
-                        return f"{protocol}://{target['ip']}:{port_num}"
+        # Check facts for web services: first HTTP-looking port wins
+        first = next(
+            (
+                (target["ip"], port_num, svc_lower)
+                for target in facts.get("targets", [])
+                for port_num, svc_lower in (
+                    (int(port), service.lower())
+                    for port, service in target.get("services", {}).items()
+                )
+                if port_num in _PORT_PROTOCOL or "http" in svc_lower
+            ),
+            None
+        )
+        
+        if first:
+            ip, port_num, svc_lower = first
+            proto = _PORT_PROTOCOL.get(port_num)
+            if not proto:
+                # Fall back to inspecting the service string
+                proto = "https" if "ssl" in svc_lower else "http"
+            return f"{proto}://{ip}:{port_num}"
         
         return None
     
@@ -96,22 +136,20 @@ class WhatWebTool(BaseTool):
         # WhatWeb output format:
         # http://target [200 OK] Apache[2.4.41], PHP[7.4.3], WordPress[5.8]
         
-        lines = output.split('\n')
-        
-        for line in lines:
+        for line in io.StringIO(output):
             line = line.strip()
             
             if not line or line.startswith('#'):
                 continue
             
+            # Character scan is cheaper than a regex dispatch
+            if '[' not in line:
+                continue
+            
             # Parse technologies
-            if '[' in line and ']' in line:
-                # Extract all tech[version] patterns
-                import re
-                
+            if ']' in line:
                 # Find all patterns like: Technology[version]
-                pattern = r'(\w+)\[([^\]]*)\]'
-                matches = re.findall(pattern, line)
+                matches = _WHATWEB_TECH_RE.findall(line)
                 
                 for tech, version in matches:
                     tech_info = {
@@ -120,16 +158,17 @@ class WhatWebTool(BaseTool):
                     }
                     
                     # Categorize
-                    if tech.lower() in ['apache', 'nginx', 'iis', 'lighttpd']:
+                    lname = tech.lower()
+                    if lname in _WHATWEB_SERVERS:
                         facts["server"] = f"{tech} {version}".strip()
                     
-                    elif tech.lower() in ['wordpress', 'joomla', 'drupal']:
+                    elif lname in _WHATWEB_CMS:
                         facts["cms"] = f"{tech} {version}".strip()
                     
-                    elif tech.lower() in ['php', 'python', 'ruby', 'asp.net']:
+                    elif lname in _WHATWEB_LANGS:
                         facts["languages"].append(tech_info)
                     
-                    elif tech.lower() in ['jquery', 'bootstrap', 'react', 'vue', 'angular']:
+                    elif lname in _WHATWEB_FW:
                         facts["frameworks"].append(tech_info)
                     
                     facts["technologies"].append(tech_info)
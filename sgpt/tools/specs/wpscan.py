@@ -3,9 +3,71 @@ WPScan Tool
 WordPress vulnerability scanner
 """
 
+import re
+import shlex
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from sgpt.tools.registry import BaseTool, ToolSpec, ToolCategory
 from sgpt.agent.state import RedTeamPhase
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable, List, Union
+
+
+# "[+] WordPress version 5.8.1 identified" or "WordPress version: 5.8.1"
+_WPSCAN_VERSION_RE = re.compile(r'WordPress version(?:[^:\n\d]*:)?[ \t]*(\d[^\s:]*)')
+_WPSCAN_USER_RE = re.compile(r'^[ \t]*\[\+\][ \t]+(\S+)', re.MULTILINE)
+# Plugin banners and vulnerability notices in one alternation, one match
+# per line; the lookahead flags a banner that mentions vulnerabilities itself.
+_WPSCAN_PLUGIN_RE = re.compile(
+    r'\[\+\][ \t]*(?P<plugin>(?=(?P<inline>[^\n]*vulnerabilities)?)[^\n]*plugin[^\n]*)'
+    r'|(?P<vuln>vulnerabilities)[^\n]*',
+    re.IGNORECASE
+)
+# " | Username: admin, Password: secret" -> same keys as hydra's credentials
+_WPSCAN_CREDS_RE = re.compile(r'Username:[ \t]*(?P<username>[^\s,]+),?[ \t]+Password:[ \t]*(?P<password>\S+)')
+_WPSCAN_SUCCESS_RE = re.compile(r'Valid Combinations Found:|\[SUCCESS\]')
+
+# Plugins that announce themselves in response headers (X-Powered-By etc.)
+# or page-footer comments, even when they load no files wpscan can probe
+_WPSCAN_FP_PLUGINS = {
+    'w3 total cache': 'w3-total-cache',
+    'wp super cache': 'wp-super-cache',
+    'wp-super-cache': 'wp-super-cache',
+    'wp rocket': 'wp-rocket',
+    'x-litespeed-cache': 'litespeed-cache',
+}
+_WPSCAN_FP_RE = re.compile('|'.join(map(re.escape, _WPSCAN_FP_PLUGINS)), re.IGNORECASE)
+
+# bytes twins of the patterns above, so raw process output can be scanned
+# without decoding the whole buffer; only captured groups get decoded
+_WPSCAN_BYTES_RE = {
+    pattern: re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+    for pattern in (
+        _WPSCAN_VERSION_RE, _WPSCAN_USER_RE, _WPSCAN_PLUGIN_RE,
+        _WPSCAN_CREDS_RE, _WPSCAN_SUCCESS_RE, _WPSCAN_FP_RE
+    )
+}
+
+
+def _wpscan_re(pattern, chunk):
+    """Pick the str or bytes variant of pattern to match chunk with"""
+    return _WPSCAN_BYTES_RE[pattern] if isinstance(chunk, (bytes, bytearray)) else pattern
+
+
+def _text(value):
+    """Decode a captured bytes group; str passes through"""
+    return value.decode('utf-8', 'replace') if isinstance(value, (bytes, bytearray)) else value
+
+
+_WPSCAN_USERS_LIST = "/usr/share/wordlists/users.txt"
+_WPSCAN_PASSWORDS_LIST = "/usr/share/wordlists/rockyou.txt"
+
+_WPSCAN_CMD_TEMPLATES = {
+    "enumerate_wordpress": "wpscan --url {url}",
+    "enumerate_users": "wpscan --url {url} --enumerate u",
+    "enumerate_plugins": "wpscan --url {url} --enumerate p",
+    "password_attack": "wpscan --url {url} -U {usernames} -P {passwords}",
+}
 
 
 class WPScanTool(BaseTool):
@@ -82,27 +144,71 @@ class WPScanTool(BaseTool):
     ) -> str:
         """Generate wpscan command"""
         
+        template = _WPSCAN_CMD_TEMPLATES.get(intent)
+        if template is None:
+            return None
+        
         url = context.get('url') or facts.get('target_url')
         if not url:
             return None
         
-        if intent == "enumerate_wordpress":
-            cmd = f"wpscan --url {url}"
-            return cmd
-        
-        elif intent == "enumerate_users":
-            return f"wpscan --url {url} --enumerate u"
+        return template.format(
+            url=shlex.quote(url),
+            usernames=_WPSCAN_USERS_LIST,
+            passwords=_WPSCAN_PASSWORDS_LIST
+        )
+    
+    def generate_commands_batch(
+        self,
+        intents: List[str],
+        contexts: List[dict],
+        facts_list: List[dict]
+    ) -> List[str]:
+        """Generate one wpscan command per (intent, context, facts) triple"""
         
-        elif intent == "enumerate_plugins":
-            cmd = f"wpscan --url {url} --enumerate p"
-            return cmd
+        return [
+            self.generate_command(intent, context, facts)
+            for intent, context, facts in zip(intents, contexts, facts_list, strict=True)
+        ]
+    
+    @staticmethod
+    def run_batch(
+        commands: List[str],
+        runner: Callable[[str], Any],
+        max_workers: int = 3,
+        stagger: float = 0.5,
+        rate_per_minute: int = 30
+    ) -> List[Any]:
+        """
+        Run commands through runner concurrently
         
-        elif intent == "password_attack":
-            usernames = "/usr/share/wordlists/users.txt"
-            passwords = "/usr/share/wordlists/rockyou.txt"
-            return f"wpscan --url {url} -U {usernames} -P {passwords}"
+        Submissions are staggered and capped at rate_per_minute so several
+        scans don't hit shared hosts at once. Results keep command order;
+        None commands are skipped and yield None.
+        """
+        started = deque()
+        futures = []
         
-        return None
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for cmd in commands:
+                if cmd is None:
+                    futures.append(None)
+                    continue
+                
+                if started:
+                    time.sleep(stagger)
+                
+                # Sliding one-minute window rate limit
+                if rate_per_minute and len(started) >= rate_per_minute:
+                    wait = 60 - (time.monotonic() - started[0])
+                    if wait > 0:
+                        time.sleep(wait)
+                    started.popleft()
+                
+                started.append(time.monotonic())
+                futures.append(pool.submit(runner, cmd))
+            
+            return [f.result() if f is not None else None for f in futures]
     
     def validate_parameters(self, intent: str, parameters: Dict[str, Any]) -> bool:
         """Validate parameters for intent"""
@@ -115,58 +221,73 @@ class WPScanTool(BaseTool):
         
         return True
     
-    def parse_output(self, intent: str, output: str) -> Dict[str, Any]:
-        """Parse wpscan output into structured facts"""
+    def parse_output(
+        self,
+        intent: str,
+        output: Union[str, bytes, Iterable[Union[str, bytes]]]
+    ) -> Dict[str, Any]:
+        """
+        Parse wpscan output into structured facts
+        
+        output may be the whole capture (str or raw bytes) or any iterable
+        of lines (e.g. a process's stdout); lines are scanned as they
+        arrive, never joined, and bytes are matched without decoding.
+        """
         
         facts = {}
+        chunks = (output,) if isinstance(output, (str, bytes, bytearray)) else output
         
         if intent == "enumerate_wordpress":
-            # Extract WordPress version
-            if 'WordPress version' in output:
-                for line in output.split('\n'):
-                    if 'WordPress version' in line:
-                        parts = line.split(':')
-                        if len(parts) > 1:
-                            facts['wp_version'] = parts[1].strip()
+            for chunk in chunks:
+                versions = _wpscan_re(_WPSCAN_VERSION_RE, chunk).findall(chunk)
+                if versions:
+                    facts['wp_version'] = _text(versions[-1])
         
         elif intent == "enumerate_users":
-            # Extract usernames
             facts['users'] = []
-            lines = output.split('\n')
-            
-            for line in lines:
-                if '[i] User(s) Identified:' in line:
-                    # Next lines contain usernames
-                    continue
-                if line.strip().startswith('[+]'):
-                    username = line.split('[+]')[1].strip().split()[0]
-                    facts['users'].append(username)
+            for chunk in chunks:
+                facts['users'].extend(
+                    _text(user) for user in _wpscan_re(_WPSCAN_USER_RE, chunk).findall(chunk)
+                )
         
         elif intent == "enumerate_plugins":
             # Extract vulnerable plugins
             facts['plugins'] = []
             facts['vulnerable_plugins'] = []
-            
-            # Parse plugin information
-            in_plugin_section = False
+            facts['fingerprinted_plugins'] = []
             current_plugin = None
             
-            for line in output.split('\n'):
-                if '[+]' in line and 'plugin' in line.lower():
-                    plugin_name = line.split('[+]')[1].strip()
-                    facts['plugins'].append(plugin_name)
-                    current_plugin = plugin_name
+            for chunk in chunks:
+                for marker in _wpscan_re(_WPSCAN_FP_RE, chunk).findall(chunk):
+                    slug = _WPSCAN_FP_PLUGINS[_text(marker).lower()]
+                    if slug not in facts['fingerprinted_plugins']:
+                        facts['fingerprinted_plugins'].append(slug)
                 
-                if current_plugin and 'vulnerabilities' in line.lower():
-                    facts['vulnerable_plugins'].append(current_plugin)
+                for match in _wpscan_re(_WPSCAN_PLUGIN_RE, chunk).finditer(chunk):
+                    if match.lastgroup == 'plugin':
+                        current_plugin = _text(match['plugin']).strip()
+                        facts['plugins'].append(current_plugin)
+                        if match['inline']:
+                            facts['vulnerable_plugins'].append(current_plugin)
+                    elif current_plugin:
+                        facts['vulnerable_plugins'].append(current_plugin)
+            
+            # Fingerprints wpscan's own banners did not already report
+            facts['plugins'].extend(
+                slug for slug in facts['fingerprinted_plugins']
+                if not any(slug in plugin for plugin in facts['plugins'])
+            )
         
         elif intent == "password_attack":
-            # Check for successful login
-            facts['credentials'] = []
-            
-            if 'Valid Combinations Found:' in output or '[SUCCESS]' in output:
-                for line in output.split('\n'):
-                    if 'Username:' in line and 'Password:' in line:
-                        facts['credentials'].append(line.strip())
+            # Credentials only count once wpscan reports a successful login
+            found = []
+            success = False
+            for chunk in chunks:
+                success = success or _wpscan_re(_WPSCAN_SUCCESS_RE, chunk).search(chunk) is not None
+                found.extend(
+                    {key: _text(value) for key, value in m.groupdict().items()}
+                    for m in _wpscan_re(_WPSCAN_CREDS_RE, chunk).finditer(chunk)
+                )
+            facts['credentials'] = found if success else []
         
         return facts
@@ -4,23 +4,61 @@ Structured logging system for ShellGPT agent
 """
 
 import logging
+import threading
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 from datetime import datetime
 import json
+import time
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize a log record dict, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+
+# Record attributes (passed via extra=) copied into structured JSON logs
+_JSON_EXTRA_FIELDS = ('phase', 'step', 'tool', 'command', 'exit_code', 'details')
+
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+
+def _level(name: str) -> int:
+    """Resolve a level name such as "info" to its logging constant"""
+    try:
+        return _LEVELS[name.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {name}") from None
+
 
 class AgentLogger:
     """Centralized logging system for agent operations"""
     
     _instance = None
+    _lock = threading.RLock()
     
     def __new__(cls):
         """Singleton pattern"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
@@ -28,13 +66,13 @@ class AgentLogger:
         if self._initialized:
             return
         
-        self.logger = logging.getLogger("sgpt")
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Remove existing handlers
-        self.logger.handlers = []
-        
-        self._initialized = True
+        with self._lock:
+            if self._initialized:
+                return
+            
+            self.logger = logging.getLogger("sgpt")
+            self.logger.setLevel(logging.DEBUG)
+            self._initialized = True
     
     def setup(
         self,
@@ -52,15 +90,35 @@ class AgentLogger:
             file_level: File logging level
             enable_rotation: Enable log rotation
         """
+        # Resolve levels first so a typo fails before any handler is added
+        console_levelno = _level(console_level)
+        file_levelno = _level(file_level)
+        
         # Default log directory
         if log_dir is None:
             log_dir = Path.home() / ".sgpt" / "logs"
         
         log_dir.mkdir(parents=True, exist_ok=True)
         
+        with self._lock:
+            self._setup_handlers(log_dir, console_levelno, file_levelno, enable_rotation)
+    
+    def _setup_handlers(
+        self,
+        log_dir: Path,
+        console_levelno: int,
+        file_levelno: int,
+        enable_rotation: bool
+    ):
+        """Replace the logger's handlers; caller holds _lock"""
+        # Remove existing handlers so repeated setup() calls don't stack them
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        
         # Console handler
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(getattr(logging, console_level.upper()))
+        console_handler.setLevel(console_levelno)
         console_handler.setFormatter(ConsoleFormatter())
         self.logger.addHandler(console_handler)
         
@@ -81,7 +139,7 @@ class AgentLogger:
                 backupCount=5
             )
         
-        file_handler.setLevel(getattr(logging, file_level.upper()))
+        file_handler.setLevel(file_levelno)
         file_handler.setFormatter(FileFormatter())
         self.logger.addHandler(file_handler)
         
@@ -94,18 +152,24 @@ class AgentLogger:
         json_handler.setLevel(logging.INFO)
         json_handler.setFormatter(JSONFormatter())
         self.logger.addHandler(json_handler)
+        
+        # Let the logger drop records no handler would emit before they are built
+        self.logger.setLevel(min(h.level or logging.DEBUG for h in self.logger.handlers))
     
     def debug(self, message: str, **kwargs):
         """Log debug message"""
-        self.logger.debug(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, extra=kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message"""
-        self.logger.info(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, extra=kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message"""
-        self.logger.warning(message, extra=kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, extra=kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message"""
@@ -115,6 +179,11 @@ class AgentLogger:
         """Log critical message"""
         self.logger.critical(message, exc_info=True, extra=kwargs)
     
+    def flush(self):
+        """Flush all handlers so written records are visible on disk"""
+        for handler in self.logger.handlers:
+            handler.flush()
+    
     # Specialized logging methods
     
     def log_agent_step(self, phase: str, step: str, details: Dict[str, Any] = None):
@@ -162,7 +231,26 @@ class AgentLogger:
         )
 
 
-class ConsoleFormatter(logging.Formatter):
+class _SecondCachedFormatter(logging.Formatter):
+    """Formatter base that renders record.created once per wall-clock second"""
+    
+    time_format = '%H:%M:%S'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_sec = None
+        self._cached_time = ""
+    
+    def _timestamp(self, record) -> str:
+        """Return record.created formatted with time_format"""
+        sec = int(record.created)
+        if sec != self._last_sec:
+            self._cached_time = time.strftime(self.time_format, time.localtime(sec))
+            self._last_sec = sec
+        return self._cached_time
+
+
+class ConsoleFormatter(_SecondCachedFormatter):
     """Colorful console formatter"""
     
     COLORS = {
@@ -180,17 +268,19 @@ class ConsoleFormatter(logging.Formatter):
         reset = self.COLORS['RESET']
         
         # Format: [TIME] LEVEL: message
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = self._timestamp(record)
         
         return f"{color}[{timestamp}] {record.levelname:8s}{reset}: {record.getMessage()}"
 
 
-class FileFormatter(logging.Formatter):
+class FileFormatter(_SecondCachedFormatter):
     """Detailed file formatter"""
     
+    time_format = '%Y-%m-%d %H:%M:%S'
+    
     def format(self, record):
         """Format log record for file"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = self._timestamp(record)
         
         # Include extra fields if present
         extra = ""
@@ -208,27 +298,18 @@ class JSONFormatter(logging.Formatter):
     def format(self, record):
         """Format log record as JSON"""
         log_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
         }
         
         # Add extra fields
-        if hasattr(record, 'phase'):
-            log_data['phase'] = record.phase
-        if hasattr(record, 'step'):
-            log_data['step'] = record.step
-        if hasattr(record, 'tool'):
-            log_data['tool'] = record.tool
-        if hasattr(record, 'command'):
-            log_data['command'] = record.command
-        if hasattr(record, 'exit_code'):
-            log_data['exit_code'] = record.exit_code
-        if hasattr(record, 'details'):
-            log_data['details'] = record.details
-        
-        return json.dumps(log_data)
+        log_data.update({
+            k: getattr(record, k) for k in _JSON_EXTRA_FIELDS if hasattr(record, k)
+        })
+        
+        return _dumps(log_data)
 
 
 # Global logger instance
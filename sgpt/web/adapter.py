@@ -1,5 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
+
+# Runs in the page: innerText of the last element matching the selector
+_LAST_TEXT_JS = """(sel) => {
+    const els = document.querySelectorAll(sel);
+    return els.length ? els[els.length - 1].innerText : '';
+}"""
+
+# Same element, but only the length of its text crosses the wire
+_LAST_TEXT_LEN_JS = """(sel) => {
+    const els = document.querySelectorAll(sel);
+    return els.length ? els[els.length - 1].innerText.length : 0;
+}"""
+
+# Number of elements matching each selector, in one round-trip
+_COUNTS_JS = """(sels) => sels.map(s => document.querySelectorAll(s).length)"""
 
 class WebProviderAdapter(ABC):
     """
@@ -41,3 +56,59 @@ class WebProviderAdapter(ABC):
         Wait for the response to be generated.
         """
         pass
+
+    def last_text(self, page: Any, selector: str) -> str:
+        """
+        Text of the last element matching selector ("" if none), fetched
+        with a single page.evaluate round-trip.
+        """
+        return page.evaluate(_LAST_TEXT_JS, selector)
+
+    def element_counts(self, page: Any, selectors: List[str]) -> List[int]:
+        """
+        How many elements currently match each selector.
+        """
+        return page.evaluate(_COUNTS_JS, selectors)
+
+    def wait_for_new_element(
+        self,
+        page: Any,
+        selectors: List[str],
+        baseline: List[int],
+        interval_ms: int = 300,
+        timeout_ms: int = 20000
+    ) -> Optional[str]:
+        """
+        Poll until one of selectors matches more elements than its baseline
+        count. Returns that selector, or None on timeout.
+        """
+        for _ in range(max(1, timeout_ms // interval_ms)):
+            counts = self.element_counts(page, selectors)
+            for selector, current, before in zip(selectors, counts, baseline, strict=True):
+                if current > before:
+                    return selector
+            page.wait_for_timeout(interval_ms)
+        return None
+
+    def wait_for_stable_text(
+        self,
+        page: Any,
+        selector: str,
+        interval_ms: int = 400,
+        stable_samples: int = 2,
+        timeout_ms: int = 120000
+    ) -> None:
+        """
+        Poll the last element matching selector until its text is non-empty
+        and its length unchanged for stable_samples consecutive samples, or
+        timeout_ms.
+        """
+        previous = None
+        stable = 0
+        for _ in range(max(1, timeout_ms // interval_ms)):
+            current = page.evaluate(_LAST_TEXT_LEN_JS, selector)
+            stable = stable + 1 if current and current == previous else 0
+            if stable >= stable_samples:
+                return
+            previous = current
+            page.wait_for_timeout(interval_ms)
@@ -1,9 +1,6 @@
-from playwright.sync_api import sync_playwright
 import typer
+from sgpt.utils.logging import get_logger
 from sgpt.web.config import get_profile_dir
-from sgpt.web.providers.chatgpt import ChatGPTProvider
-from sgpt.web.providers.gemini import GeminiProvider
-from sgpt.web.providers.claude import ClaudeProvider
 
 class BrowserSession:
     def __init__(self, provider_name: str = "chatgpt"):
@@ -12,33 +9,53 @@ class BrowserSession:
         self.provider_name = provider_name
         self.profile_path = get_profile_dir(provider_name)
         
+        # Providers pull in playwright; import only the one requested so
+        # non-web CLI invocations never pay for it.
         if provider_name == "chatgpt":
+            from sgpt.web.providers.chatgpt import ChatGPTProvider
             self.adapter = ChatGPTProvider()
         elif provider_name == "gemini":
+            from sgpt.web.providers.gemini import GeminiProvider
             self.adapter = GeminiProvider()
         elif provider_name == "claude":
+            from sgpt.web.providers.claude import ClaudeProvider
             self.adapter = ClaudeProvider()
         else:
             raise ValueError(f"Provider {provider_name} not implemented yet.")
         self.browser = None
         self.page = None
         self.playwright_context = None
+        self.playwright = None
+
+    def __enter__(self):
+        try:
+            self.start()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def start(self):
         """Launches the persistent browser session."""
         if self.browser:
             return
 
+        from playwright.sync_api import sync_playwright
+
         self.playwright_context = sync_playwright()
         self.playwright = self.playwright_context.start()
 
         # Try to launch branded browsers first to avoid Cloudflare detection
         # Priority: Chrome -> Edge -> Bundled Chromium
         channels = ["chrome", "msedge", None]
+        logger = get_logger()
         
         for channel in channels:
             try:
-                typer.echo(f"Attempting to launch browser ({channel or 'bundled chromium'})...")
+                logger.debug("Attempting browser launch", channel=channel or "bundled chromium")
                 self.browser = self.playwright.chromium.launch_persistent_context(
                     user_data_dir=self.profile_path,
                     headless=False,
@@ -54,7 +71,7 @@ class BrowserSession:
                 )
                 break 
             except Exception as e:
-                typer.echo(f"  Failed: {e}")
+                logger.debug(f"Browser launch failed: {e}", channel=channel or "bundled chromium")
                 continue
         
         if not self.browser:
@@ -63,7 +80,7 @@ class BrowserSession:
         self.page = self.browser.pages[0] if self.browser.pages else self.browser.new_page()
         
         # Navigate & Preflight
-        typer.echo(f"Opening {self.adapter.url}...")
+        logger.debug(f"Opening {self.adapter.url}")
         self.page.goto(self.adapter.url)
         
         while not self.adapter.preflight_check(self.page):
@@ -86,10 +103,11 @@ class BrowserSession:
         if not self.browser or not self.page:
             raise RuntimeError("Session not started.")
             
-        typer.echo("Sending prompt...")
+        logger = get_logger()
+        logger.debug("Sending prompt", provider=self.provider_name)
         self.adapter.send_prompt(self.page, prompt)
         
-        typer.echo("Waiting for response...")
+        logger.debug("Waiting for response", provider=self.provider_name)
         self.adapter.wait_for_response(self.page)
         
         return self.adapter.extract_response(self.page)
@@ -104,10 +122,11 @@ class BrowserSession:
             self.playwright = None
 
     def run(self, prompt: str) -> str:
-        """Wrapper for one-off execution."""
-        try:
-            self.start()
-            return self.send_prompt(prompt)
-        finally:
-            self.close()
+        """
+        Starts the session if needed and sends one prompt.
+        The browser stays open for further prompts; call close() (or use
+        the session as a context manager) when done.
+        """
+        self.start()
+        return self.send_prompt(prompt)
 
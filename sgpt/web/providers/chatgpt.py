@@ -2,6 +2,13 @@ from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from sgpt.web.adapter import WebProviderAdapter
 import time
 
+# Ready when the prompt box is visible and no login button is
+_READY_JS = """() => {
+    const visible = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    return visible(document.querySelector('#prompt-textarea'))
+        && !visible(document.querySelector("button[data-testid='login-button']"));
+}"""
+
 class ChatGPTProvider(WebProviderAdapter):
     @property
     def url(self) -> str:
@@ -9,12 +16,9 @@ class ChatGPTProvider(WebProviderAdapter):
 
     def preflight_check(self, page: Page) -> bool:
         try:
-            # Check for input area
-            if not page.is_visible("#prompt-textarea", timeout=10000):
-                return False
-            # Check if we are logged in (if login button is visible, we are NOT ready)
-            if page.is_visible("button[data-testid='login-button']"):
-                return False
+            # Input area visible and logged in (no login button), checked
+            # together in the page; returns as soon as both hold
+            page.wait_for_function(_READY_JS, timeout=10000)
             return True
         except Exception:
             return False
@@ -53,10 +57,6 @@ class ChatGPTProvider(WebProviderAdapter):
         # Typical selector: [data-message-author-role="assistant"] .markdown
         
         try:
-            responses = page.locator('[data-message-author-role="assistant"] .markdown')
-            count = responses.count()
-            if count > 0:
-                return responses.nth(count - 1).inner_text()
-            return ""
+            return self.last_text(page, '[data-message-author-role="assistant"] .markdown')
         except Exception:
             return "Error extracting response."
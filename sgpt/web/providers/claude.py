@@ -1,6 +1,7 @@
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from sgpt.web.adapter import WebProviderAdapter
-import time
+
+_REPLY_SELECTOR = ".font-claude-message"
 
 class ClaudeProvider(WebProviderAdapter):
     @property
@@ -20,6 +21,9 @@ class ClaudeProvider(WebProviderAdapter):
             return False
 
     def send_prompt(self, page: Page, prompt: str) -> None:
+        # Count existing replies so the wait can tell the new one from the last one
+        self._reply_counts = self.element_counts(page, [_REPLY_SELECTOR])
+        
         page.click("div[contenteditable='true']")
         page.keyboard.type(prompt)
         page.keyboard.press("Enter")
@@ -27,19 +31,28 @@ class ClaudeProvider(WebProviderAdapter):
         # Check if we hit message limit? (Future)
 
     def wait_for_response(self, page: Page) -> None:
-        # Claude shows a typing indicator or "Stop" button.
-        # Often has a specific class for the "Generating" state.
+        # Wait for the new reply element, then for the "Stop" button shown
+        # while generating to go away (immediate if it is already gone), and
+        # finally for the reply text to stop changing.
+        baseline = getattr(self, "_reply_counts", None)
+        if baseline is None:
+            baseline = self.element_counts(page, [_REPLY_SELECTOR])
+        self._reply_counts = None
+        
+        # No new reply means nothing to extract, not the previous answer again
+        self._has_new_reply = self.wait_for_new_element(page, [_REPLY_SELECTOR], baseline) is not None
+        if not self._has_new_reply:
+            return
         
         try:
-             # Wait for response text to appear
-             page.wait_for_timeout(2000)
-             # Wait for cursor to stop blinking?
-             # Simple wait for now.
-             page.wait_for_timeout(5000)
-        except Exception:
+            page.wait_for_selector('button[aria-label*="Stop"]', state="hidden", timeout=120000)
+        except PlaywrightTimeoutError:
             pass
+        self.wait_for_stable_text(page, _REPLY_SELECTOR)
 
     def extract_response(self, page: Page) -> str:
+        if not getattr(self, "_has_new_reply", True):
+            return ""
         try:
             # Select messages.
             # Usually .font-claude-message or similar.
@@ -47,13 +60,12 @@ class ClaudeProvider(WebProviderAdapter):
             # This is hard to guess.
             
             # Use specific hierarchy if possible.
-            responses = page.locator(".font-claude-message")
-            count = responses.count()
-            if count > 0:
+            response = self.last_text(page, _REPLY_SELECTOR)
+            if response:
                 # The last one might be empty if streaming? 
                 # Or the last one is the assistant.
                 # Claude alternates User / Assistant.
-                return responses.nth(count - 1).inner_text()
+                return response
             return ""
         except Exception:
             return "Error extracting response (Claude selectors need update)."
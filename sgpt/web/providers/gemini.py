@@ -1,6 +1,8 @@
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import Page
 from sgpt.web.adapter import WebProviderAdapter
-import time
+
+# Reply containers, preferred first; extract_response falls back in the same order
+_REPLY_SELECTORS = ["message-content", ".model-response-text"]
 
 class GeminiProvider(WebProviderAdapter):
     @property
@@ -20,55 +22,44 @@ class GeminiProvider(WebProviderAdapter):
             return False
 
     def send_prompt(self, page: Page, prompt: str) -> None:
+        # Count existing replies so the wait can tell the new one from the last one
+        self._reply_selector = None
+        self._reply_counts = self.element_counts(page, _REPLY_SELECTORS)
+        
         # Focus and fill
         page.click("div[contenteditable='true']")
         page.keyboard.type(prompt)
         page.keyboard.press("Enter")
 
     def wait_for_response(self, page: Page) -> None:
-        # Gemini usually shows a spinner or "Stop" button.
-        # Wait for "Response" container to appear or stabilize?
-        # Better: Wait for the result to stop streaming.
-        # Gemini logic is tricky without seeing DOM.
-        # Generic fallback: Wait for arbitrary time? No, dumb.
-        # Wait for "model-response" count to increase?
+        # Gemini streams into a new reply element; wait for it to appear, then
+        # consider it done once its text length holds still for three samples
+        # 300ms apart. Adapts to reply length instead of a fixed sleep.
+        baseline = getattr(self, "_reply_counts", None)
+        if baseline is None:
+            baseline = self.element_counts(page, _REPLY_SELECTORS)
+        self._reply_counts = None
         
-        # Taking a guess at current Gemini DOM:
-        # It usually has a stop button/icon script.
-        time.sleep(2) # Wait for request to register
-        try:
-            # Wait for some "streaming" indicator?
-            # Or simplified: Wait for text to stabilize?
-            
-            # Let's assume standard behavior:
-            # 1. Wait 3 sec.
-            # 2. Wait for static state?
-            # For now, I'll use a fixed wait + check loop because I lack selectors.
-            # actually, I can try to find selectors via search if needed, but I'll write a "Generous" waiter.
-            
-            # Wait for a new message chunk?
-            page.wait_for_timeout(4000) # Initial generation
-            
-            # TODO: Improve with real selector
-            pass
-        except Exception:
-            pass
+        # No new reply means nothing to extract, not the previous answer again
+        self._reply_selector = self.wait_for_new_element(page, _REPLY_SELECTORS, baseline)
+        self._has_new_reply = self._reply_selector is not None
+        if self._has_new_reply:
+            self.wait_for_stable_text(page, self._reply_selector, interval_ms=300, stable_samples=3)
 
     def extract_response(self, page: Page) -> str:
+        if not getattr(self, "_has_new_reply", True):
+            return ""
         try:
             # Gemini responses are usually in <message-content> or .model-response
             # Let's try locating all message texts
             # .message-content
-            responses = page.locator("message-content")
-            count = responses.count()
-            if count > 0:
-                return responses.nth(count - 1).inner_text()
-            
-            # Fallback
-            responses = page.locator(".model-response-text") 
-            count = responses.count()
-            if count > 0:
-                return responses.nth(count - 1).inner_text()
+            # Read from whichever container the new reply appeared in first
+            preferred = getattr(self, "_reply_selector", None)
+            selectors = sorted(_REPLY_SELECTORS, key=lambda sel: sel != preferred)
+            for selector in selectors:
+                response = self.last_text(page, selector)
+                if response:
+                    return response
                 
             return ""
         except Exception:
@@ -1,18 +1,35 @@
 import json
+from typing import Optional
 import typer
 from sgpt.web.config import WEB_CONFIG_DIR
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 CONSENT_FILE = WEB_CONFIG_DIR / "consent.json"
 
+# Answer for this process once known; consent doesn't change mid-run
+_CONSENT_CACHE: Optional[bool] = None
+
 def check_consent() -> bool:
-    if CONSENT_FILE.exists():
-        try:
-            with open(CONSENT_FILE, "r") as f:
-                data = json.load(f)
-                if data.get("consented"):
-                    return True
-        except Exception:
-            pass
+    global _CONSENT_CACHE
+    if _CONSENT_CACHE is not None:
+        return _CONSENT_CACHE
+    
+    _CONSENT_CACHE = _check_consent()
+    return _CONSENT_CACHE
+
+def _check_consent() -> bool:
+    # Missing (FileNotFoundError is an OSError) or corrupt file: ask again
+    try:
+        data = _loads(CONSENT_FILE.read_bytes())
+    except (OSError, ValueError):
+        data = None
+    if isinstance(data, dict) and data.get("consented"):
+        return True
             
     # Prompt
     typer.echo("")
@@ -25,8 +42,7 @@ def check_consent() -> bool:
     
     if confirm:
         WEB_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CONSENT_FILE, "w") as f:
-            json.dump({"consented": True}, f)
+        CONSENT_FILE.write_bytes(b'{"consented": true}')
         return True
     
     return False
@@ -1,3 +1,4 @@
+import copy
 import os
 
 import pytest
@@ -6,3 +7,46 @@ import pytest
 @pytest.fixture(autouse=True)
 def mock_os_name(monkeypatch):
     monkeypatch.setattr(os, "name", "test")
+
+
+@pytest.fixture(scope="session")
+def tool_registry():
+    """ToolRegistry with all specs loaded once per test session"""
+    from sgpt.tools.registry import ToolRegistry
+
+    registry = ToolRegistry()
+    registry.load_tools()
+    return registry
+
+
+@pytest.fixture(scope="session")
+def tool_availability(tool_registry, tmp_path_factory):
+    """PATH lookups for every registered binary, done once per session"""
+    from sgpt.tools.availability import ToolAvailabilityChecker
+
+    cache_path = tmp_path_factory.mktemp("sgpt_cache") / "tool_avail.json"
+    return ToolAvailabilityChecker.check_all(tool_registry, cache_path=cache_path, use_cache=True)
+
+
+@pytest.fixture(scope="module")
+def persistence(tmp_path_factory):
+    """AgentPersistence over one temp state directory per test module"""
+    from sgpt.agent.persistence import AgentPersistence
+
+    return AgentPersistence(tmp_path_factory.mktemp("sgpt_state"))
+
+
+@pytest.fixture(scope="session")
+def base_state():
+    """Baseline AgentState shared by the session; deepcopy it before mutating"""
+    from sgpt.agent.state import AgentState
+
+    return AgentState.initialize(session_id="shared", goal="Baseline assessment")
+
+
+@pytest.fixture
+def fresh_state(base_state, request):
+    """Private deepcopy of base_state with a session ID unique to the test"""
+    state = copy.deepcopy(base_state)
+    state.session_id = request.node.name
+    return state
@@ -2,6 +2,7 @@
 Demo script for rich CLI formatting
 """
 
+import os
 import sys
 from pathlib import Path
 import time
@@ -10,24 +11,35 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sgpt.cli.formatter import AgentFormatter, header, phase, command, success, error, warning, info
 
-print("\n" + "=" * 60)
+_BAR = "=" * 60
+
+# Seconds to pause between demos; 0 (default) for instant CI/smoke runs,
+# DEMO_PAUSE=1 for an interactive walkthrough
+PAUSE = float(os.environ.get("DEMO_PAUSE", "0"))
+
+
+def _pause(seconds: float = PAUSE):
+    if seconds:
+        time.sleep(seconds)
+
+print("\n" + _BAR)
 print("Rich CLI Formatting Demo")
-print("=" * 60 + "\n")
+print(_BAR + "\n")
 
 # Demo 1: Header
 print("Demo 1: Header")
 header("ShellGPT v2 - Red Team Automation", "Autonomous security testing agent")
-time.sleep(1)
+_pause()
 
 # Demo 2: Phase transition
 print("\nDemo 2: Phase Transition")
 phase("RECONNAISSANCE", "Discovering live hosts and services")
-time.sleep(1)
+_pause()
 
 # Demo 3: Command proposal
 print("\nDemo 3: Command Proposal")
 command("nmap -sn 192.168.1.0/24", tool="nmap")
-time.sleep(1)
+_pause()
 
 # Demo 4: Messages
 print("\nDemo 4: Status Messages")
@@ -35,12 +47,12 @@ success("Command executed successfully")
 warning("Rate limiting detected - waiting 5 seconds")
 error("Connection timeout", details="Target host unreachable after 3 retries")
 info("Session saved to disk")
-time.sleep(1)
+_pause()
 
 # Demo 5: Execution panel
 print("\nDemo 5: Execution Instructions")
 AgentFormatter.print_execution("exec_abc123", "nmap -sn 192.168.1.0/24")
-time.sleep(1)
+_pause()
 
 # Demo 6: Result
 print("\nDemo 6: Execution Result")
@@ -48,7 +60,7 @@ AgentFormatter.print_result(
     exit_code=0,
     output="Starting Nmap 7.94\\nHost is up (0.00012s latency)\\nNmap done: 256 IP addresses scanned in 2.45 seconds"
 )
-time.sleep(1)
+_pause()
 
 # Demo 7: Facts table
 print("\nDemo 7: Discovered Facts")
@@ -66,7 +78,7 @@ facts = {
     'targets': ['192.168.1.1', '192.168.1.10']
 }
 AgentFormatter.print_facts(facts)
-time.sleep(1)
+_pause()
 
 # Demo 8: Tools table
 print("\nDemo 8: Tool Availability")
@@ -81,7 +93,7 @@ tools = {
     'python_script': True
 }
 AgentFormatter.print_tools(tools)
-time.sleep(1)
+_pause()
 
 # Demo 9: Session summary
 print("\nDemo 9: Session Summary")
@@ -94,17 +106,17 @@ session = {
     'done': False
 }
 AgentFormatter.print_session_summary(session)
-time.sleep(1)
+_pause()
 
 # Demo 10: Progress bar
 print("\nDemo 10: Progress Bar")
 progress = AgentFormatter.create_progress()
 with progress:
     task = progress.add_task("[cyan]Scanning network...", total=100)
-    for i in range(100):
-        progress.update(task, advance=1)
-        time.sleep(0.02)
+    for _ in range(20):
+        progress.advance(task, 5)
+        _pause(PAUSE / 10)
 
-print("\n" + "=" * 60)
+print("\n" + _BAR)
 print("✅ Demo Complete!")
-print("=" * 60)
+print(_BAR)
@@ -5,7 +5,7 @@ Test Agent Resume Functionality
 import sys
 from pathlib import Path
 import tempfile
-import json
+from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -14,24 +14,27 @@ from sgpt.agent.persistence import AgentPersistence
 from sgpt.agent.loop import Agent
 from sgpt.agent.resume import AgentResume
 
-print("=" * 60)
+_BAR = "=" * 60
+_NOW = datetime.now()
+
+print(_BAR)
 print("Testing Agent Resume Functionality")
-print("=" * 60)
+print(_BAR)
 
 # Test 1: Create and save session
 print("\n✓ Test 1: Create Session State")
 
-storage_path = Path(tempfile.mkdtemp()) / "agent_sessions"
+tmp_dir = tempfile.TemporaryDirectory()
+storage_path = Path(tmp_dir.name) / "agent_sessions"
 persistence = AgentPersistence(storage_path)
 
 state = AgentState.initialize("test_resume_session", "Test resume functionality")
-state.facts.live_hosts.append("192.168.1.1")
-state.facts.live_hosts.append("192.168.1.10")
-from datetime import datetime
+state.facts.live_hosts.add("192.168.1.1")
+state.facts.live_hosts.add("192.168.1.10")
 state.commands_executed.append(Command(
     command='nmap -sn 192.168.1.0/24',
     tool_used='nmap',
-    timestamp=datetime.now(),
+    timestamp=_NOW,
     exit_code=0,
     output='Scan output',
     phase=RedTeamPhase.RECON,
@@ -104,12 +107,11 @@ AgentResume.print_resume_summary(context)
 print(f"  ✅ Summary displayed")
 
 # Cleanup
-import shutil
-shutil.rmtree(storage_path.parent, ignore_errors=True)
+tmp_dir.cleanup()
 
-print("\n" + "=" * 60)
+print("\n" + _BAR)
 print("All Tests Passed! ✅")
-print("=" * 60)
+print(_BAR)
 print("\nAgent resume functionality is operational!")
 print(f"\nUsage:")
 print(f"  sgpt agent resume SESSION_ID")
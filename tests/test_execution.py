@@ -10,9 +10,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sgpt.agent.execution import ExecutionTracker, ExecutionStatus
 
-print("=" * 60)
+_BAR = "=" * 60
+
+print(_BAR)
 print("Testing Real Execution System")
-print("=" * 60)
+print(_BAR)
 
 # Test 1: Initialize tracker
 print("\n✓ Test 1: Initialize ExecutionTracker")
@@ -66,7 +68,7 @@ print("\n✓ Cleanup")
 tracker.cleanup_session("test_session")
 print("  ✅ Session cleaned up")
 
-print("\n" + "=" * 60)
+print("\n" + _BAR)
 print("All Tests Passed! ✅")
-print("=" * 60)
+print(_BAR)
 print("\nReal execution system is operational!")
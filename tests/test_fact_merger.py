@@ -10,9 +10,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from sgpt.agent.state import AgentState, Target
 from sgpt.agent.fact_merger import FactMerger
 
-print("=" * 60)
+_BAR = "=" * 60
+
+print(_BAR)
 print("Testing Fact Merger")
-print("=" * 60)
+print(_BAR)
 
 # Initialize state
 state = AgentState.initialize(
@@ -103,7 +105,29 @@ print(f"     Targets: {summary['targets_identified']}")
 print(f"     Ports: {summary['total_ports']}")
 print(f"     Vulnerabilities: {summary['vulnerabilities_found']}")
 
-print("\n" + "=" * 60)
+# Test 8: Batch merge matches sequential merges
+print("\n✓ Test 8: Batch Merge")
+batch_state = AgentState.initialize(
+    session_id="test_merger_batch",
+    goal="Test batched fact merging"
+)
+FactMerger.merge_batch(batch_state, [
+    {"hosts": ["192.168.1.1", "192.168.1.10", "192.168.1.20"]},
+    {"hosts": ["192.168.1.1", "192.168.1.30"]},
+    {"targets": [{"ip": "192.168.1.1", "ports": [22, 80]}]},
+    {"targets": [{"ip": "192.168.1.1", "ports": [443]}, {"ip": "192.168.1.40", "ports": [21]}]},
+    new_facts,
+    new_facts,
+])
+assert len(batch_state.facts.live_hosts) == 5  # 4 hosts + 192.168.1.40 from targets
+assert len(batch_state.facts.targets) == 2
+assert batch_state.facts.targets[0].ports == [22, 80, 443]
+assert len(batch_state.facts.vulnerabilities) == 1
+print(f"  ✅ Batched {len(batch_state.facts.live_hosts)} hosts, "
+      f"{len(batch_state.facts.targets)} targets, "
+      f"{len(batch_state.facts.vulnerabilities)} vulnerability")
+
+print("\n" + _BAR)
 print("All Tests Passed! ✅")
-print("=" * 60)
+print(_BAR)
 print("\nFact merging system is operational!")
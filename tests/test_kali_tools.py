@@ -2,80 +2,73 @@
 Test New Kali Linux Tools
 """
 
+import importlib
 import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
-from sgpt.tools.specs.masscan import MasscanTool
-from sgpt.tools.specs.sqlmap import SQLMapTool
-from sgpt.tools.specs.wpscan import WPScanTool
-from sgpt.tools.specs.crackmapexec import CrackMapExecTool
-from sgpt.tools.specs.netcat import NetcatTool
 
-print("=" * 60)
-print("Testing New Kali Linux Tools")
-print("=" * 60)
+# tool module -> (class, action, context, facts)
+CASES = {
+    "masscan": ("MasscanTool", "fast_port_scan", {'network': {'subnet': '192.168.1.0/24'}}, {}),
+    "sqlmap": ("SQLMapTool", "test_injection", {'url': 'http://example.com?id=1'}, {}),
+    "wpscan": ("WPScanTool", "enumerate_users", {'url': 'https://wordpress.example.com'}, {}),
+    "crackmapexec": ("CrackMapExecTool", "smb_login", {}, {'live_hosts': ['192.168.1.10']}),
+    "netcat": ("NetcatTool", "port_check", {'target': '192.168.1.10'}, {}),
+}
 
-# Test 1: Masscan
-print("\n✓ Test 1: Masscan Tool")
-masscan = MasscanTool()
-masscan = MasscanTool()
-context = {'network': {'subnet': '192.168.1.0/24'}}
-cmd = masscan.generate_command('fast_port_scan', context, {})
-print(f"  Command: {cmd}")
-assert "masscan" in cmd and "192.168.1.0/24" in cmd
-print(f"  ✅ Masscan working")
+# tool module -> substrings the generated command must contain
+EXPECT = {
+    "masscan": ("masscan", "192.168.1.0/24"),
+    "sqlmap": ("sqlmap", "http://example.com?id=1"),
+    "wpscan": ("wpscan", "enumerate u"),
+    "crackmapexec": ("crackmapexec smb", "admin"),
+    "netcat": ("nc", "192.168.1.10"),
+}
 
-# Test 2: SQLMap
-print("\n✓ Test 2: SQLMap Tool")
-sqlmap = SQLMapTool()
-context = {'url': 'http://example.com?id=1'}
-cmd = sqlmap.generate_command('test_injection', context, {})
-print(f"  Command: {cmd}")
-assert "sqlmap" in cmd and "http://example.com?id=1" in cmd
-print(f"  ✅ SQLMap working")
 
-# Test 3: WPScan
-print("\n✓ Test 3: WPScan Tool")
-wpscan = WPScanTool()
-context = {'url': 'https://wordpress.example.com'}
-cmd = wpscan.generate_command('enumerate_users', context, {})
-print(f"  Command: {cmd}")
-assert "wpscan" in cmd and "enumerate u" in cmd
-print(f"  ✅ WPScan working")
+@pytest.fixture
+def load_tool():
+    """Import a tool spec module on demand and instantiate its tool class"""
+    def _load(module: str, class_name: str):
+        spec_module = importlib.import_module(f"sgpt.tools.specs.{module}")
+        return getattr(spec_module, class_name)()
+    return _load
 
-# Test 4: CrackMapExec
-print("\n✓ Test 4: CrackMapExec Tool")
-cme = CrackMapExecTool()
-facts = {'live_hosts': ['192.168.1.10']}
-cmd = cme.generate_command('smb_login', {}, facts)
-print(f"  Command: {cmd}")
-assert "crackmapexec smb" in cmd and "admin" in cmd
-print(f"  ✅ CrackMapExec working")
 
-# Test 5: Netcat
-print("\n✓ Test 5: Netcat Tool")
-nc = NetcatTool()
-context = {'target': '192.168.1.10'}
-cmd = nc.generate_command('port_check', context, {})
-print(f"  Command: {cmd}")
-assert "nc" in cmd and "192.168.1.10" in cmd
-print(f"  ✅ Netcat working")
+@pytest.mark.parametrize("module", list(CASES))
+def test_generate_command(load_tool, module):
+    class_name, action, context, facts = CASES[module]
+    cmd = load_tool(module, class_name).generate_command(action, context, facts)
+    print(f"  Command: {cmd}")
+    for needle in EXPECT[module]:
+        assert needle in cmd, f"{needle!r} missing from {cmd!r}"
 
-# Summary
-print("\n" + "=" * 60)
-print("All Tests Passed! ✅")
-print("=" * 60)
 
-total_intents = 5 # Placeholder
 
-print(f"\n🎉 5 New Kali Tools Added!")
-print(f"📊 Total New Intents: {total_intents}")
-print(f"\n🛠️  Tools:")
-print(f"   - Masscan: Ultra-fast port scanning")
-print(f"   - SQLMap: SQL injection testing")
-print(f"   - WPScan: WordPress security")
-print(f"   - CrackMapExec: SMB exploitation")
-print(f"   - Netcat: Network utilities")
-print(f"\n🚀 Total Arsenal: 14 tools!")
+def test_wpscan_run_batch(monkeypatch):
+    wpscan_module = importlib.import_module("sgpt.tools.specs.wpscan")
+    clock = [0.0]
+    sleeps = []
+    
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+    
+    monkeypatch.setattr(wpscan_module.time, "sleep", fake_sleep)
+    monkeypatch.setattr(wpscan_module.time, "monotonic", lambda: clock[0])
+    
+    results = wpscan_module.WPScanTool.run_batch(
+        ["scan a", None, "scan b", "scan c"],
+        runner=str.upper,
+        stagger=0.5,
+        rate_per_minute=2
+    )
+    
+    assert results == ["SCAN A", None, "SCAN B", "SCAN C"]
+    # Two staggers, then the third submission waits out the one-minute window
+    assert sleeps == [0.5, 0.5, 59.0]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,121 @@
+"""
+Test State Persistence
+"""
+
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from sgpt.agent.persistence import AgentPersistence
+from sgpt.agent.state import AgentState, Command, RedTeamPhase
+
+
+def _command(text: str) -> Command:
+    return Command(
+        timestamp=datetime(2024, 1, 1),
+        command=text,
+        phase=RedTeamPhase.RECON,
+        tool_used=text.split()[0],
+        exit_code=0,
+        output="",
+        facts_extracted={}
+    )
+
+
+def _sidecar(tmp_path, session_id: str) -> list:
+    path = tmp_path / "agents" / session_id / "commands.ndjson"
+    return [json.loads(line)["command"] for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def state():
+    state = AgentState.initialize(session_id="persist", goal="Persistence test")
+    state.add_command(_command("nmap c1"))
+    state.add_command(_command("nmap c2"))
+    return state
+
+
+def test_append_after_load(tmp_path, state):
+    AgentPersistence(tmp_path).save_state(state)
+    
+    persistence = AgentPersistence(tmp_path)
+    loaded = persistence.load_state("persist")
+    loaded.add_command(_command("nmap c3"))
+    persistence.save_state(loaded)
+    
+    assert _sidecar(tmp_path, "persist") == ["nmap c1", "nmap c2", "nmap c3"]
+    reloaded = AgentPersistence(tmp_path).load_state("persist")
+    assert [c.command for c in reloaded.commands_executed] == ["nmap c1", "nmap c2", "nmap c3"]
+
+
+def test_legacy_inline_commands_migrate(tmp_path, state):
+    session_dir = tmp_path / "agents" / "persist"
+    session_dir.mkdir(parents=True)
+    (session_dir / "state.json").write_text(json.dumps(state.to_dict()))
+    
+    persistence = AgentPersistence(tmp_path)
+    loaded = persistence.load_state("persist")
+    assert [c.command for c in loaded.commands_executed] == ["nmap c1", "nmap c2"]
+    
+    persistence.save_state(loaded)
+    assert _sidecar(tmp_path, "persist") == ["nmap c1", "nmap c2"]
+    assert "commands_executed" not in json.loads((session_dir / "state.json").read_text())
+
+
+def test_rewrite_when_history_shrinks(tmp_path, state):
+    persistence = AgentPersistence(tmp_path)
+    persistence.save_state(state)
+    
+    state.commands_executed.pop()
+    persistence.save_state(state)
+    
+    assert _sidecar(tmp_path, "persist") == ["nmap c1"]
+
+
+def test_buffered_flush(tmp_path, state):
+    persistence = AgentPersistence(tmp_path)
+    state_file = tmp_path / "agents" / "persist" / "state.json"
+    
+    with persistence.buffered():
+        persistence.save_state(state)
+        state.add_command(_command("nmap c3"))
+        persistence.save_state(state)
+        assert not state_file.exists()
+        assert len(persistence.load_state("persist").commands_executed) == 3
+    
+    assert state_file.exists()
+    assert _sidecar(tmp_path, "persist") == ["nmap c1", "nmap c2", "nmap c3"]
+
+
+def test_other_writer_forces_rewrite(tmp_path, state):
+    writer_a = AgentPersistence(tmp_path)
+    writer_a.save_state(state)
+    
+    writer_b = AgentPersistence(tmp_path)
+    state_b = writer_b.load_state("persist")
+    state_b.add_command(_command("nmap c3"))
+    writer_b.save_state(state_b)
+    
+    state.add_command(_command("nmap c4"))
+    writer_a.save_state(state)
+    
+    assert _sidecar(tmp_path, "persist") == ["nmap c1", "nmap c2", "nmap c4"]
+
+
+
+def test_live_hosts_keep_discovery_order(tmp_path, state):
+    for ip in ("192.168.1.9", "192.168.1.10", "10.0.0.5", "192.168.1.9"):
+        state.facts.add_host(ip)
+    
+    assert state.facts.to_dict()["live_hosts"] == ["192.168.1.9", "192.168.1.10", "10.0.0.5"]
+    
+    persistence = AgentPersistence(tmp_path)
+    persistence.save_state(state)
+    loaded = AgentPersistence(tmp_path).load_state("persist")
+    assert list(loaded.facts.live_hosts) == ["192.168.1.9", "192.168.1.10", "10.0.0.5"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
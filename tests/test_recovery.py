@@ -4,115 +4,106 @@ Test Error Recovery System
 
 import sys
 import asyncio
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from sgpt.agent.retry import RetryHandler, with_retry
 from sgpt.agent.state import AgentState
 from sgpt.agent.persistence import AgentPersistence
 from sgpt.agent.recovery import StateRecovery
 
-print("=" * 60)
-print("Testing Error Recovery System")
-print("=" * 60)
 
-# Test 1: Retry logic
-print("\n✓ Test 1: Retry with Exponential Backoff")
+def _no_sleep(delay):
+    """Skip backoff delays; the retry logic is under test, not the clock"""
 
-attempt_count = 0
 
-def flaky_function():
-    global attempt_count
-    attempt_count += 1
+@pytest.fixture(scope="module")
+def loop():
+    """One event loop for every async case in this module"""
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.close()
+
+
+def test_retry_sync():
+    """Test 1: Retry with exponential backoff"""
+    attempts = 0
     
-    if attempt_count < 3:
-        raise Exception(f"Attempt {attempt_count} failed!")
+    def flaky_function():
+        nonlocal attempts
+        attempts += 1
+        
+        if attempts < 3:
+            raise Exception(f"Attempt {attempts} failed!")
+        
+        return "Success!"
     
-    return "Success!"
-
-result = RetryHandler.retry_sync(flaky_function, max_attempts=3, base_delay=0.1)
-assert result == "Success!"
-print(f"  ✅ Function succeeded on attempt {attempt_count}")
+    result = RetryHandler.retry_sync(flaky_function, max_attempts=3, base_delay=0.1, sleep_fn=_no_sleep)
+    assert result == "Success!"
+    assert attempts == 3
 
-# Test 2: Async retry
-print("\n✓ Test 2: Async Retry")
 
-async def test_async_retry():
-    global attempt_count
-    attempt_count = 0
+def test_async_retry(loop):
+    """Test 2: Async retry"""
+    attempts = 0
     
     async def async_flaky():
-        global attempt_count
-        attempt_count += 1
+        nonlocal attempts
+        attempts += 1
         
-        if attempt_count < 2:
+        if attempts < 2:
             raise Exception("Async failure!")
         
         return "Async success!"
     
-    result = await RetryHandler.retry_async(async_flaky, max_attempts=3, base_delay=0.1)
+    result = loop.run_until_complete(
+        RetryHandler.retry_async(async_flaky, max_attempts=3, base_delay=0.1, sleep_fn=_no_sleep)
+    )
     assert result == "Async success!"
-    print(f"  ✅ Async succeeded on attempt {attempt_count}")
-
-asyncio.run(test_async_retry())
+    assert attempts == 2
 
-# Test 3: Decorator
-print("\n✓ Test 3: Retry Decorator")
 
-call_count = 0
-
-@with_retry(max_attempts=3, base_delay=0.1)
-def decorated_function():
-    global call_count
-    call_count += 1
+def test_retry_decorator():
+    """Test 3: Retry decorator"""
+    calls = 0
     
-    if call_count < 2:
-        raise ValueError("Decorated failure!")
+    @with_retry(max_attempts=3, base_delay=0.1, sleep_fn=_no_sleep)
+    def decorated_function():
+        nonlocal calls
+        calls += 1
+        
+        if calls < 2:
+            raise ValueError("Decorated failure!")
+        
+        return "Decorated success!"
     
-    return "Decorated success!"
-
-call_count = 0
-result = decorated_function()
-assert result == "Decorated success!"
-print(f"  ✅ Decorated function succeeded")
-
-# Test 4: State Recovery
-print("\n✓ Test 4: State Backup & Recovery")
+    assert decorated_function() == "Decorated success!"
+    assert calls == 2
 
-storage_path = Path("c:/temp/sgpt_recovery_test")
-persistence = AgentPersistence(storage_path)
-recovery = StateRecovery(persistence)
 
-state = AgentState.initialize("test_recovery", "Test recovery system")
-state.facts.live_hosts.append("192.168.1.1")
-
-# Create backup
-recovery.create_backup(state, "test")
-print(f"  ✅ Created backup")
-
-# Validate
-is_valid = recovery.validate_state(state)
-assert is_valid
-print(f"  ✅ State validation passed")
-
-# Restore
-restored = recovery.restore_from_backup("test_recovery")
-assert restored is not None
-assert restored.session_id == "test_recovery"
-print(f"  ✅ Restored from backup")
-
-# Test 5: Auto-save
-print("\n✓ Test 5: Auto-Save")
-
-recovery.auto_save(state)
-print(f"  ✅ Auto-save completed")
+def test_state_recovery(tmp_path):
+    """Test 4 and 5: State backup, recovery and auto-save"""
+    persistence = AgentPersistence(tmp_path)
+    recovery = StateRecovery(persistence)
+    
+    state = AgentState.initialize("test_recovery", "Test recovery system")
+    state.facts.live_hosts.add("192.168.1.1")
+    
+    # Create backup
+    recovery.create_backup(state, "test")
+    
+    # Validate
+    assert recovery.validate_state(state)
+    
+    # Restore
+    restored = recovery.restore_from_backup("test_recovery")
+    assert restored is not None
+    assert restored.session_id == "test_recovery"
+    
+    # Auto-save
+    recovery.auto_save(state)
+    assert persistence.load_state("test_recovery") is not None
 
-# Cleanup
-import shutil
-shutil.rmtree(storage_path, ignore_errors=True)
 
-print("\n" + "=" * 60)
-print("All Tests Passed! ✅")
-print("=" * 60)
-print("\nError recovery system is operational!")
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,76 +2,80 @@
 Test SMBClient Tool
 """
 
+import shlex
 import sys
-from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from sgpt.tools.specs.smbclient import SMBClientTool
 
-print("=" * 60)
-print("Testing SMBClient Tool")
-print("=" * 60)
-
-tool = SMBClientTool()
-
-# Test 1: List shares
-print("\n✓ Test 1: List Shares")
-facts = {'live_hosts': ['192.168.1.10']}
-cmd = tool.generate_command('list_shares', {}, facts)
-print(f"  Command: {cmd}")
-assert cmd == "smbclient -L //192.168.1.10 -N"
-print(f"  ✅ Anonymous share listing")
-
-# Test 2: List shares with credentials
-print("\n✓ Test 2: List Shares (Authenticated)")
-facts = {
-    'live_hosts': ['192.168.1.10'],
-    'credentials': [{'ip': '192.168.1.10', 'username': 'admin', 'password': 'password123'}]
-}
-cmd = tool.generate_command('list_shares', {}, facts)
-print(f"  Command: {cmd}")
-assert cmd == "smbclient -L //192.168.1.10 -U admin%password123"
-print(f"  ✅ Authenticated share listing")
-
-# Test 3: List files in share
-print("\n✓ Test 3: List Files")
-facts = {'live_hosts': ['192.168.1.10']}
-context = {
-    'share': 'Users',
-    'directory': '/Documents'
-}
-cmd = tool.generate_command('list_files', context, facts)
-print(f"  Command: {cmd}")
-assert "smbclient //192.168.1.10/Users" in cmd
-assert "cd /Documents; ls" in cmd
-print(f"  ✅ File listing command")
-
-# Test 4: Download file
-print("\n✓ Test 4: Download File")
-facts = {'live_hosts': ['192.168.1.10']}
-context = {
-    'share': 'Users',
-    'remote_file': 'document.pdf',
-    'local_file': '/tmp/document.pdf'
+HOST_FACTS = {'live_hosts': ['192.168.1.10']}
+
+# action -> (context, expected substrings)
+EXPECT = {
+    'list_files': (
+        {'share': 'Users', 'directory': '/Documents'},
+        ("smbclient //192.168.1.10/Users", "cd /Documents; ls"),
+    ),
+    'download_file': (
+        {'share': 'Users', 'remote_file': 'document.pdf', 'local_file': '/tmp/document.pdf'},
+        ("get document.pdf /tmp/document.pdf",),
+    ),
+    'check_access': (
+        {'share': 'IPC$'},
+        ("smbclient '//192.168.1.10/IPC$'",),
+    ),
 }
-cmd = tool.generate_command('download_file', context, facts)
-print(f"  Command: {cmd}")
-assert "get document.pdf /tmp/document.pdf" in cmd
-print(f"  ✅ File download command")
-
-# Test 5: Check access
-print("\n✓ Test 5: Check Access")
-facts = {'live_hosts': ['192.168.1.10']}
-context = {'share': 'IPC$'}
-cmd = tool.generate_command('check_access', context, facts)
-print(f"  Command: {cmd}")
-assert "smbclient //192.168.1.10/IPC$" in cmd
-print(f"  ✅ Access check command")
-
-# Summary
-print("\n" + "=" * 60)
-print("All Tests Passed! ✅")
-print("=" * 60)
-print(f"\nSMBClient tool ready:")
-print(f"  Category: {tool.spec.category.value}")
+
+SHARE_LISTING = """
+\tSharename       Type      Comment
+\t---------       ----      -------
+\tADMIN$          Disk      Remote Admin
+\tIPC$            IPC       IPC Service (Disk share)
+\tprint$          Disk
+"""
+
+
+@pytest.fixture(scope="module")
+def tool():
+    return SMBClientTool()
+
+
+def test_list_shares_anonymous(tool):
+    cmd = tool.generate_command('list_shares', {}, HOST_FACTS)
+    assert cmd == "smbclient -L //192.168.1.10 -N"
+
+
+def test_list_shares_authenticated(tool):
+    facts = {
+        'live_hosts': ['192.168.1.10'],
+        'credentials': [{'ip': '192.168.1.10', 'username': 'admin', 'password': 'password123'}]
+    }
+    cmd = tool.generate_command('list_shares', {}, facts)
+    assert cmd == "smbclient -L //192.168.1.10 -U admin%password123"
+
+
+@pytest.mark.parametrize("action", list(EXPECT))
+def test_generate_command(tool, action):
+    context, needles = EXPECT[action]
+    cmd = tool.generate_command(action, context, HOST_FACTS)
+    print(f"  Command: {cmd}")
+    for needle in needles:
+        assert needle in cmd, f"{needle!r} missing from {cmd!r}"
+
+
+def test_quotes_context_values(tool):
+    context = {'share': 'Users', 'remote_file': "a'b; id", 'local_file': 'out.txt'}
+    cmd = tool.generate_command('download_file', context, HOST_FACTS)
+    assert shlex.split(cmd)[-2:] == ['-c', "get a'b; id out.txt"]
+
+
+def test_parse_share_listing(tool):
+    shares = tool.parse_output(SHARE_LISTING)['shares']
+    assert [s['type'] for s in shares] == ['Disk', 'IPC', 'Disk']
+    assert shares[1]['comment'] == "IPC Service (Disk share)"
+    assert shares[2]['comment'] == ""
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,111 @@
+"""
+Verify Phase 2 completion
+"""
+
+import importlib
+import sys
+
+import pytest
+
+from sgpt.agent.state import AgentState, RedTeamPhase
+from sgpt.tools.safety import SafetyValidator
+
+
+@pytest.mark.parametrize("module, name", [
+    ("sgpt.agent.loop", "Agent"),
+    ("sgpt.agent.persistence", "AgentPersistence"),
+    ("sgpt.tools.registry", "ToolRegistry"),
+    ("sgpt.tools.availability", "ToolAvailabilityChecker"),
+])
+def test_module_imports(module, name):
+    """Test 1: Module imports"""
+    assert hasattr(importlib.import_module(module), name)
+
+
+def test_tool_registry(tool_registry):
+    """Test 2: Tool registry loads the tool specs"""
+    print(f"  Loaded {len(tool_registry.tools)} tools: {', '.join(tool_registry.tools)}")
+    assert tool_registry.tools
+
+
+@pytest.mark.parametrize("command, expected_safe", [
+    ("nmap -sn 192.168.1.0/24", True),
+    ("rm -rf /", False),
+])
+def test_safety_validation(command, expected_safe):
+    """Test 3: Safety validation"""
+    is_safe, reason = SafetyValidator.validate(command)
+    assert is_safe == expected_safe, reason
+
+
+def test_command_generation(tool_registry):
+    """Test 4: Tool command generation"""
+    cmd = tool_registry["nmap"].generate_command(
+        intent="host_discovery",
+        context={"network": {"subnet": "10.0.0.0/24"}},
+        facts={}
+    )
+    assert "nmap" in cmd
+    assert "10.0.0.0/24" in cmd
+
+
+def test_tool_availability(tool_availability):
+    """Test 5: Tool availability detection"""
+    available_count = sum(1 for v in tool_availability.values() if v)
+    print(f"  {available_count}/{len(tool_availability)} tools available")
+    assert all(isinstance(v, bool) for v in tool_availability.values())
+
+
+def test_tool_availability_cache(tool_registry, monkeypatch, tmp_path):
+    """Test 5b: Unchanged PATH reuses cached results without scanning"""
+    from sgpt.tools import availability
+    
+    cache_path = tmp_path / "tool_avail.json"
+    monkeypatch.setenv("PATH", "")
+    first = availability.ToolAvailabilityChecker.check_all(tool_registry, cache_path=cache_path, use_cache=True)
+    assert cache_path.exists()
+    assert not any(first.values())
+    
+    def _no_scan(path):
+        raise AssertionError("PATH scanned despite a fresh cache")
+    
+    monkeypatch.setattr(availability, "_path_executables", _no_scan)
+    assert availability.ToolAvailabilityChecker.check_all(tool_registry, cache_path=cache_path, use_cache=True) == first
+    
+    # A different PATH misses the cache
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with pytest.raises(AssertionError):
+        availability.ToolAvailabilityChecker.check_all(tool_registry, cache_path=cache_path, use_cache=True)
+
+
+def test_tool_availability_cache_is_opt_in(tool_registry, monkeypatch, tmp_path):
+    """Test 5c: The default check neither reads nor writes the cache file"""
+    from sgpt.tools import availability
+    
+    cache_path = tmp_path / "tool_avail.json"
+    monkeypatch.setattr(availability, "_AVAIL_CACHE_PATH", cache_path)
+    availability.ToolAvailabilityChecker.check_all(tool_registry)
+    assert not cache_path.exists()
+
+
+def test_agent_state():
+    """Test 6: Agent state management"""
+    state = AgentState.initialize(
+        session_id="test_verify",
+        goal="Phase 2 verification"
+    )
+    
+    # Test state properties
+    assert state.session_id == "test_verify"
+    assert state.goal == "Phase 2 verification"
+    assert state.phase == RedTeamPhase.RECON
+    assert state.created_at is not None
+    
+    # Test serialization
+    state_dict = state.to_dict()
+    assert "session_id" in state_dict
+    assert "goal" in state_dict
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,129 +0,0 @@
-"""
-Simple test runner to verify Phase 2 completion
-"""
-
-import sys
-import os
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-print("=" * 60)
-print("ShellGPT v2 - Phase 2 Verification")
-print("=" * 60)
-
-# Test 1: Import all modules
-print("\n✓ Test 1: Module Imports")
-try:
-    from sgpt.agent.state import AgentState, RedTeamPhase
-    from sgpt.agent.loop import Agent
-    from sgpt.agent.persistence import AgentPersistence
-    from sgpt.tools.registry import ToolRegistry
-    from sgpt.tools.safety import SafetyValidator
-    from sgpt.tools.availability import ToolAvailabilityChecker
-    print("  ✅ All modules imported successfully")
-except Exception as e:
-    print(f"  ❌ Import failed: {e}")
-    sys.exit(1)
-
-# Test 2: Tool Registry
-print("\n✓ Test 2: Tool Registry")
-try:
-    registry = ToolRegistry()
-    registry.load_tools()
-    tool_count = len(registry._tools)
-    print(f"  ✅ Loaded {tool_count} tools")
-    
-    # List tools
-    for name in registry._tools.keys():
-        print(f"     - {name}")
-except Exception as e:
-    print(f"  ❌ Tool registry failed: {e}")
-    sys.exit(1)
-
-# Test 3: Safety Validator
-print("\n✓ Test 3: Safety Validation")
-try:
-    # Test safe command
-    is_safe, reason = SafetyValidator.validate("nmap -sn 192.168.1.0/24")
-    assert is_safe, "Nmap command should be safe"
-    print("  ✅ Safe command passed: nmap")
-    
-    # Test destructive command
-    is_safe, reason = SafetyValidator.validate("rm -rf /")
-    assert not is_safe, "rm -rf should be blocked"
-    print(f"  ✅ Destructive command blocked: {reason}")
-except Exception as e:
-    print(f"  ❌ Safety validation failed: {e}")
-    sys.exit(1)
-
-# Test 4: Tool Command Generation
-print("\n✓ Test 4: Command Generation")
-try:
-    nmap = registry.get("nmap")
-    if nmap:
-        cmd = nmap.generate_command(
-            intent="host_discovery",
-            context={"network": {"subnet": "10.0.0.0/24"}},
-            facts={}
-        )
-        assert "nmap" in cmd
-        assert "10.0.0.0/24" in cmd
-        print(f"  ✅ Nmap command: {cmd}")
-    else:
-        print("  ⚠️  Nmap tool not loaded")
-except Exception as e:
-    print(f"  ❌ Command generation failed: {e}")
-    sys.exit(1)
-
-# Test 5: Tool Availability
-print("\n✓ Test 5: Tool Availability Detection")
-try:
-    availability = ToolAvailabilityChecker.check_all(registry)
-    available_count = sum(1 for v in availability.values() if v)
-    print(f"  ✅ {available_count}/{len(availability)} tools available")
-    
-    for binary, status in sorted(availability.items()):
-        symbol = "✅" if status else "❌"
-        print(f"     {symbol} {binary}")
-except Exception as e:
-    print(f"  ❌ Availability check failed: {e}")
-    sys.exit(1)
-
-# Test 6: Agent State
-print("\n✓ Test 6: Agent State Management")
-try:
-    state = AgentState.initialize(
-        session_id="test_verify",
-        goal="Phase 2 verification"
-    )
-    
-    # Test state properties
-    assert state.session_id == "test_verify"
-    assert state.goal == "Phase 2 verification"
-    assert state.phase == RedTeamPhase.RECON
-    assert state.created_at is not None
-    
-    # Test serialization
-    state_dict = state.to_dict()
-    assert "session_id" in state_dict
-    assert "goal" in state_dict
-    
-    print(f"  ✅ State created: {state.session_id}")
-    print(f"     Goal: {state.goal}")
-    print(f"     Phase: {state.phase.value}")
-except Exception as e:
-    print(f"  ❌ Agent state failed: {e}")
-    sys.exit(1)
-
-# Summary
-print("\n" + "=" * 60)
-print("VERIFICATION COMPLETE")
-print("=" * 60)
-print("✅ All Phase 2 components operational")
-print("\nPhase 2 Status: COMPLETE")
-print("Total Code: ~4,200 lines")
-print("Tools: 5 operational")
-print("Safety Patterns: 23")
-print("=" * 60)